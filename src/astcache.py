@@ -0,0 +1,74 @@
+import marshal
+import os
+
+from htmlnode import LeafNode, ParentNode
+from markdown_blocks import PARSER_VERSION
+
+
+default_max_bytes = 256 * 1024 * 1024
+
+
+class ASTCache:
+    def __init__(self, dir_path, max_bytes=default_max_bytes):
+        self.dir_path = dir_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, digest):
+        return os.path.join(self.dir_path, digest[:2], digest)
+
+    def get(self, digest):
+        path = self.entry_path(digest)
+        try:
+            with open(path, "rb") as f:
+                version, data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        if version != PARSER_VERSION:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return decode_node(data)
+
+    def put(self, digest, node):
+        path = self.entry_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump((PARSER_VERSION, encode_node(node)), f)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        entries = []
+        total = 0
+        for dir_path, _, filenames in os.walk(self.dir_path):
+            for filename in filenames:
+                path = os.path.join(dir_path, filename)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+
+def encode_node(node):
+    if isinstance(node, ParentNode):
+        return (node.tag, [encode_node(child) for child in node.children], node.props)
+    return (node.tag, node.value, node.props)
+
+
+def decode_node(data):
+    tag, body, props = data
+    if isinstance(body, list):
+        return ParentNode(tag, [decode_node(child) for child in body], props)
+    return LeafNode(tag, body, props)
@@ -0,0 +1,202 @@
+import random
+import sys
+import timeit
+
+from corpus import CorpusShape, make_page
+from htmlnode import ParentNode
+from inline_markdown import (
+    configure_inline_cache,
+    default_inline_cache_bytes,
+    text_to_textnodes,
+)
+from markdown_blocks import (
+    BLOCK_HANDLERS,
+    BlockType,
+    code_to_html_node,
+    iter_blocks,
+    olist_to_html_node,
+    paragraph_to_html_node,
+    quote_to_html_node,
+    text_to_children,
+    typed_block_to_html_node,
+    ulist_to_html_node,
+)
+from textnode import (
+    TEXT_NODE_HANDLERS,
+    TextType,
+    bold_to_leaf_node,
+    code_to_leaf_node,
+    image_to_leaf_node,
+    italic_to_leaf_node,
+    link_to_leaf_node,
+    text_node_to_html_node,
+    text_to_leaf_node,
+)
+
+
+def ifchain_text_node_to_html_node(text_node):
+    return ifchain_text_handler(text_node)(text_node)
+
+
+def ifchain_text_handler(text_node):
+    if text_node.text_type == TextType.TEXT:
+        return text_to_leaf_node
+    if text_node.text_type == TextType.BOLD:
+        return bold_to_leaf_node
+    if text_node.text_type == TextType.ITALIC:
+        return italic_to_leaf_node
+    if text_node.text_type == TextType.CODE:
+        return code_to_leaf_node
+    if text_node.text_type == TextType.LINK:
+        return link_to_leaf_node
+    if text_node.text_type == TextType.IMAGE:
+        return image_to_leaf_node
+    raise ValueError(f"invalid text type: {text_node.text_type}")
+
+
+def table_text_handler(text_node):
+    handler = TEXT_NODE_HANDLERS.get(text_node.text_type)
+    if handler is None:
+        raise ValueError(f"invalid text type: {text_node.text_type}")
+    return handler
+
+
+def loop_heading_to_html_node(lines):
+    block = "\n".join(lines)
+    level = loop_heading_level(block)
+    if level + 1 >= len(block):
+        raise ValueError(f"invalid heading level: {level}")
+    return ParentNode(f"h{level}", text_to_children(block[level + 1 :]))
+
+
+def ifchain_block_to_html_node(block_type, lines):
+    return ifchain_block_handler(block_type)(lines)
+
+
+def ifchain_block_handler(block_type):
+    if block_type == BlockType.PARAGRAPH:
+        return paragraph_to_html_node
+    if block_type == BlockType.HEADING:
+        return loop_heading_to_html_node
+    if block_type == BlockType.CODE:
+        return code_to_html_node
+    if block_type == BlockType.OLIST:
+        return olist_to_html_node
+    if block_type == BlockType.ULIST:
+        return ulist_to_html_node
+    if block_type == BlockType.QUOTE:
+        return quote_to_html_node
+    raise ValueError("invalid block type")
+
+
+def table_block_handler(block_type):
+    handler = BLOCK_HANDLERS.get(block_type)
+    if handler is None:
+        raise ValueError("invalid block type")
+    return handler
+
+
+def loop_heading_level(block):
+    level = 0
+    for char in block:
+        if char == "#":
+            level += 1
+        else:
+            break
+    return level
+
+
+def lstrip_heading_level(block):
+    return len(block) - len(block.lstrip("#"))
+
+
+def baseline(*item):
+    return None
+
+
+def make_corpus(pages, seed=0):
+    shape = CorpusShape(pages=pages, seed=seed)
+    rng = random.Random(seed)
+    blocks = []
+    for index in range(pages):
+        lines = make_page(index, shape, rng).split("\n")
+        blocks.extend(iter_blocks(lines))
+    return blocks
+
+
+def compare(before, after, items, repeat, min_calls=200000):
+    number = max(1, min_calls // len(items))
+    funcs = (before, after, baseline)
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            seconds = timeit.timeit(
+                lambda: [func(*item) for item in items], number=number
+            )
+            best[i] = min(best[i], seconds)
+    before_ns, after_ns, overhead_ns = (
+        seconds / (number * len(items)) * 1e9 for seconds in best
+    )
+    return before_ns - overhead_ns, after_ns - overhead_ns
+
+
+def print_row(name, unit, before_ns, after_ns):
+    print(
+        f"{name:<14} {before_ns:9.1f} ns/{unit:<5} -> {after_ns:9.1f} ns/{unit:<5}"
+        f"  speedup {before_ns / after_ns:5.2f}x"
+    )
+
+
+def bench(pages, repeat=7):
+    configure_inline_cache(0)
+    blocks = make_corpus(pages)
+    paragraphs = [
+        " ".join(lines)
+        for block_type, lines in blocks
+        if block_type == BlockType.PARAGRAPH
+    ]
+    spans = [(node,) for text in paragraphs for node in text_to_textnodes(text)]
+    block_types = [(block_type,) for block_type, _ in blocks]
+    headings = [
+        ("\n".join(lines),)
+        for block_type, lines in blocks
+        if block_type == BlockType.HEADING
+    ]
+    for (span,) in spans:
+        before = ifchain_text_node_to_html_node(span).to_html()
+        if text_node_to_html_node(span).to_html() != before:
+            raise ValueError(f"{span.text_type.value} outputs differ")
+    for block_type, lines in blocks:
+        before = ifchain_block_to_html_node(block_type, lines).to_html()
+        if typed_block_to_html_node(block_type, lines).to_html() != before:
+            raise ValueError(f"{block_type.value} outputs differ")
+
+    print(f"{pages} pages, {len(blocks)} blocks, {len(spans)} spans")
+    print("inline cache disabled, inputs pre-built, loop overhead subtracted")
+    print_row(
+        "span dispatch",
+        "span",
+        *compare(ifchain_text_handler, table_text_handler, spans, repeat),
+    )
+    print_row(
+        "block dispatch",
+        "block",
+        *compare(ifchain_block_handler, table_block_handler, block_types, repeat),
+    )
+    print_row(
+        "heading level",
+        "block",
+        *compare(loop_heading_level, lstrip_heading_level, headings, repeat),
+    )
+    configure_inline_cache(default_inline_cache_bytes)
+
+
+def main():
+    pages = 500
+    if len(sys.argv) > 1:
+        pages = int(sys.argv[1])
+    bench(pages)
+
+
+if __name__ == "__main__":
+    main()
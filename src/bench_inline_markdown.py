@@ -0,0 +1,73 @@
+import random
+import sys
+import timeit
+
+from inline_markdown import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textnode import TextNode, TextType
+
+
+def chained_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+def make_paragraph(spans, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    for i in range(spans):
+        kind = rng.choice(["link", "link", "link", "image", "bold", "italic", "code"])
+        if kind == "link":
+            parts.append(f"[link {i}](/pages/{i})")
+        elif kind == "image":
+            parts.append(f"![image {i}](/images/{i}.png)")
+        elif kind == "bold":
+            parts.append(f"**bold {i}**")
+        elif kind == "italic":
+            parts.append(f"_italic {i}_")
+        else:
+            parts.append(f"`code {i}`")
+        parts.append(" some plain words in between ")
+    return "".join(parts)
+
+
+def bench(spans, repeat=5):
+    text = make_paragraph(spans)
+    if chained_text_to_textnodes(text) != text_to_textnodes(text):
+        raise ValueError(f"outputs differ for {spans} spans")
+    number = max(1, 2000 // spans)
+    chained = min(
+        timeit.repeat(
+            lambda: chained_text_to_textnodes(text), number=number, repeat=repeat
+        )
+    )
+    single = min(
+        timeit.repeat(lambda: text_to_textnodes(text), number=number, repeat=repeat)
+    )
+    chained_ms = chained / number * 1000
+    single_ms = single / number * 1000
+    print(
+        f"{spans:>6} spans  chained {chained_ms:9.3f} ms  "
+        f"single-pass {single_ms:9.3f} ms  speedup {chained_ms / single_ms:6.1f}x"
+    )
+
+
+def main():
+    sizes = [10, 100, 1000, 5000]
+    if len(sys.argv) > 1:
+        sizes = [int(arg) for arg in sys.argv[1:]]
+    for spans in sizes:
+        bench(spans)
+
+
+if __name__ == "__main__":
+    main()
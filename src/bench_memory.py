@@ -0,0 +1,84 @@
+import sys
+import tracemalloc
+
+from bench_inline_markdown import make_paragraph
+from htmlnode import LeafNode, ParentNode
+from markdown_blocks import markdown_to_html_node
+from textnode import TextNode, TextType
+
+
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+def bytes_per_node(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return (after - before) / count
+
+
+def count_nodes(node):
+    total = 1
+    for child in node.children or ():
+        total += count_nodes(child)
+    return total
+
+
+def document_bytes_per_node(markdown):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    node = markdown_to_html_node(markdown)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count_nodes(node)
+
+
+def main():
+    count = 100000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    cases = [
+        (
+            "TextNode",
+            lambda: DictTextNode("text", TextType.TEXT),
+            lambda: TextNode("text", TextType.TEXT),
+        ),
+        (
+            "LeafNode",
+            lambda: DictHTMLNode(None, "text", None, None),
+            lambda: LeafNode(None, "text"),
+        ),
+        (
+            "ParentNode",
+            lambda: DictHTMLNode("p", None, [], None),
+            lambda: ParentNode("p", []),
+        ),
+    ]
+    print(f"{'node':<12}{'before':>12}{'after':>12}  (bytes per node)")
+    for name, before_factory, after_factory in cases:
+        before = bytes_per_node(before_factory, count)
+        after = bytes_per_node(after_factory, count)
+        print(f"{name:<12}{before:>12.1f}{after:>12.1f}")
+
+    markdown = "\n\n".join(make_paragraph(50, seed) for seed in range(200))
+    per_node = document_bytes_per_node(markdown)
+    print(f"document tree: {per_node:.1f} bytes per node (including text)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from corpus import CorpusShape, generate_corpus
+from gencontent import find_pages, generate_pages_recursive
+from inline_markdown import (
+    configure_inline_cache,
+    default_inline_cache_bytes,
+    text_to_textnodes,
+)
+from markdown_blocks import BlockType, block_to_block_type, markdown_to_blocks
+from markdown_blocks import markdown_to_html_node
+
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+
+def best_time(func, repeat, inline_cache_bytes):
+    best = None
+    for _ in range(repeat):
+        reset_inline_cache(inline_cache_bytes)
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def reset_inline_cache(inline_cache_bytes):
+    configure_inline_cache(0)
+    configure_inline_cache(inline_cache_bytes)
+
+
+def peak_memory(func, inline_cache_bytes):
+    reset_inline_cache(inline_cache_bytes)
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def inline_texts(markdowns):
+    texts = []
+    for markdown in markdowns:
+        for block in markdown_to_blocks(markdown):
+            if block_to_block_type(block) == BlockType.PARAGRAPH:
+                texts.append(" ".join(block.split("\n")))
+    return texts
+
+
+def run_benchmarks(
+    shape,
+    repeat=3,
+    memory=True,
+    jobs=1,
+    inline_cache_bytes=default_inline_cache_bytes,
+):
+    with tempfile.TemporaryDirectory() as tmp:
+        content_path = os.path.join(tmp, "content")
+        dest_path = os.path.join(tmp, "docs")
+        template_path = os.path.join(tmp, "template.html")
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE)
+        markdown_bytes = generate_corpus(content_path, shape)
+
+        markdowns = []
+        for from_path, _ in find_pages(content_path, dest_path):
+            with open(from_path) as f:
+                markdowns.append(f.read())
+        texts = inline_texts(markdowns)
+        trees = [markdown_to_html_node(markdown) for markdown in markdowns]
+        html_bytes = sum(len(tree.to_html().encode("utf-8")) for tree in trees)
+
+        def generate():
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages_recursive(
+                    content_path,
+                    template_path,
+                    dest_path,
+                    "/",
+                    jobs=jobs,
+                    inline_cache_bytes=inline_cache_bytes,
+                )
+
+        benchmarks = [
+            ("generate_pages_recursive", generate, markdown_bytes),
+            (
+                "markdown_to_html_node",
+                lambda: [markdown_to_html_node(markdown) for markdown in markdowns],
+                markdown_bytes,
+            ),
+            (
+                "text_to_textnodes",
+                lambda: [text_to_textnodes(text) for text in texts],
+                sum(len(text.encode("utf-8")) for text in texts),
+            ),
+            ("to_html", lambda: [tree.to_html() for tree in trees], html_bytes),
+        ]
+        results = {}
+        for name, func, size in benchmarks:
+            seconds = best_time(func, repeat, inline_cache_bytes)
+            results[name] = {
+                "seconds": seconds,
+                "pages_per_s": shape.pages / seconds,
+                "mb_per_s": size / seconds / 1e6,
+                "peak_mb": None,
+            }
+            if memory:
+                peak = peak_memory(func, inline_cache_bytes)
+                results[name]["peak_mb"] = peak / 1e6
+        return results
+
+
+def print_results(results, baseline=None):
+    header = f"{'benchmark':<26}{'seconds':>10}{'pages/s':>12}{'MB/s':>10}"
+    header += f"{'peak MB':>10}"
+    if baseline is not None:
+        header += f"{'vs base':>10}"
+    print(header)
+    for name, result in results.items():
+        peak = result["peak_mb"]
+        line = (
+            f"{name:<26}{result['seconds']:>10.4f}{result['pages_per_s']:>12.1f}"
+            f"{result['mb_per_s']:>10.2f}"
+            f"{'-' if peak is None else f'{peak:.1f}':>10}"
+        )
+        if baseline is not None and name in baseline:
+            change = result["seconds"] / baseline[name]["seconds"] - 1
+            line += f"{change * 100:>+9.1f}%"
+        print(line)
+
+
+def regressions(results, baseline, max_regression):
+    slower = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        change = result["seconds"] / baseline[name]["seconds"] - 1
+        if change * 100 > max_regression:
+            slower.append(name)
+    return slower
+
+
+def parse_args():
+    defaults = CorpusShape()
+    parser = argparse.ArgumentParser(
+        description="Benchmark the site generator on a synthetic corpus."
+    )
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--fanout", type=int, default=defaults.fanout)
+    parser.add_argument("--paragraphs", type=int, default=defaults.paragraphs)
+    parser.add_argument("--sentences", type=int, default=defaults.sentences)
+    parser.add_argument("--list-items", type=int, default=defaults.list_items)
+    parser.add_argument("--link-density", type=float, default=defaults.link_density)
+    parser.add_argument(
+        "--image-density", type=float, default=defaults.image_density
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument(
+        "--inline-cache-size",
+        type=int,
+        default=default_inline_cache_bytes // (1024 * 1024),
+        help="inline fragment cache cap in MB (0 disables it)",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the peak memory pass"
+    )
+    parser.add_argument("--save", metavar="JSON", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="JSON", help="compare with a baseline")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        metavar="PCT",
+        help="with --compare, exit 1 if any benchmark is this many percent slower",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    shape = CorpusShape(
+        pages=args.pages,
+        depth=args.depth,
+        fanout=args.fanout,
+        paragraphs=args.paragraphs,
+        sentences=args.sentences,
+        list_items=args.list_items,
+        link_density=args.link_density,
+        image_density=args.image_density,
+        seed=args.seed,
+    )
+    results = run_benchmarks(
+        shape,
+        args.repeat,
+        not args.no_memory,
+        args.jobs,
+        args.inline_cache_size * 1024 * 1024,
+    )
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            saved = json.load(f)
+        if saved["shape"] != shape.to_dict():
+            print("warning: baseline was recorded with a different corpus shape")
+        baseline = saved["results"]
+    print_results(results, baseline)
+
+    if args.save is not None:
+        with open(args.save, "w") as f:
+            json.dump({"shape": shape.to_dict(), "results": results}, f, indent=1)
+        print(f"Baseline written to {args.save}")
+    if baseline is not None and args.max_regression is not None:
+        slower = regressions(results, baseline, args.max_regression)
+        if slower:
+            print(f"Regressions over {args.max_regression}%: {', '.join(slower)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
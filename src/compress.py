@@ -0,0 +1,158 @@
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import hash_bytes
+from writer import ChangeSet, write_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESS_VERSION = 1
+default_min_size = 1024
+default_compress_threads = 4
+compressible_suffixes = (".html", ".css", ".js", ".json", ".svg", ".txt", ".xml")
+
+
+def gzip_bytes(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(data):
+    return brotli.compress(data, quality=11)
+
+
+def available_formats():
+    formats = {".gz": gzip_bytes}
+    if brotli is not None:
+        formats[".br"] = brotli_bytes
+    return formats
+
+
+class Compressor:
+    def __init__(
+        self,
+        path=None,
+        min_size=default_min_size,
+        threads=default_compress_threads,
+        formats=None,
+    ):
+        self.path = path
+        self.min_size = min_size
+        self.threads = threads
+        self.formats = available_formats() if formats is None else formats
+        self.files = {}
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != COMPRESS_VERSION:
+            return
+        self.files = data["files"]
+
+    def save(self):
+        if self.path is None:
+            return
+        dir_path = os.path.dirname(self.path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        data = {"version": COMPRESS_VERSION, "files": self.files}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def outputs(self):
+        return [
+            path + suffix
+            for path, (_, suffixes) in self.files.items()
+            for suffix in suffixes
+        ]
+
+    def compress_outputs(self, paths, changes=None):
+        if changes is None:
+            changes = ChangeSet()
+        paths = sorted(set(os.path.normpath(p) for p in paths if is_compressible(p)))
+        changed = [path in changes.changed for path in paths]
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            results = list(executor.map(self.compress_file, paths, changed))
+
+        compressed = 0
+        live = set()
+        for path, record, written in results:
+            if record is None:
+                continue
+            live.add(path)
+            previous = self.files.get(path)
+            if previous is not None:
+                dropped = set(previous[1]) - set(record[1])
+                changes.deleted(remove_variants(path, dropped))
+            self.files[path] = record
+            if written:
+                changes.wrote(path + suffix for suffix in record[1])
+                compressed += 1
+        for path in list(self.files):
+            if path not in live:
+                changes.deleted(remove_variants(path, self.files.pop(path)[1]))
+        return compressed, len(live)
+
+    def discard(self, paths, changes=None):
+        if changes is None:
+            changes = ChangeSet()
+        removed = []
+        for path in paths:
+            record = self.files.pop(os.path.normpath(path), None)
+            if record is not None:
+                removed.extend(remove_variants(path, record[1]))
+        changes.deleted(removed)
+        return removed
+
+    def compress_file(self, path, changed=True):
+        suffixes = sorted(self.formats)
+        previous = self.files.get(path)
+        if not changed:
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                return path, None, False
+            if size < self.min_size:
+                return path, None, False
+            if previous is not None and previous[1] == suffixes:
+                if all(os.path.exists(path + suffix) for suffix in suffixes):
+                    return path, previous, False
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return path, None, False
+        if len(data) < self.min_size:
+            return path, None, False
+
+        digest = hash_bytes(data)
+        record = [digest, suffixes]
+        if previous == record and all(
+            os.path.exists(path + suffix) for suffix in suffixes
+        ):
+            return path, record, False
+        for suffix in suffixes:
+            write_atomic(path + suffix, self.formats[suffix](data))
+        return path, record, True
+
+
+def is_compressible(path):
+    return path.endswith(compressible_suffixes)
+
+
+def remove_variants(path, suffixes):
+    removed = []
+    for suffix in suffixes:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+            removed.append(path + suffix)
+    return removed
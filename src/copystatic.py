@@ -1,5 +1,14 @@
+import filecmp
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from discovery import scan_trees
+from manifest import hash_file
+
+
+default_copy_threads = 8
+fingerprint_length = 10
 
 
 def copy_files_recursive(source_dir_path, dest_dir_path):
@@ -14,3 +23,146 @@ def copy_files_recursive(source_dir_path, dest_dir_path):
             shutil.copy(from_path, dest_path)
         else:
             copy_files_recursive(from_path, dest_path)
+
+
+def sync_files_recursive(
+    source_dir_path,
+    dest_dir_path,
+    manifest=None,
+    check_hash=False,
+    link=False,
+    threads=default_copy_threads,
+    files=None,
+    assets=None,
+):
+    if files is None:
+        files = find_files(source_dir_path, dest_dir_path)
+    if assets is not None:
+        digests = None
+        if manifest is not None and not check_hash:
+            digests = manifest.digests
+        files = fingerprint_files(files, dest_dir_path, assets, threads, digests)
+    changed = []
+    for from_path, dest_path in files:
+        if not is_unchanged(from_path, dest_path, check_hash):
+            print(f" * {from_path} -> {dest_path}")
+            changed.append((from_path, dest_path))
+
+    removed = []
+    if manifest is not None:
+        live_paths = set(dest_path for _, dest_path in files)
+        for dest_path in manifest.static:
+            if dest_path not in live_paths and os.path.exists(dest_path):
+                print(f" * removing {dest_path}")
+                os.remove(dest_path)
+                removed.append(dest_path)
+        manifest.static = sorted(live_paths)
+
+    for dest_dir in sorted(set(os.path.dirname(dest) for _, dest in changed)):
+        os.makedirs(dest_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [
+            executor.submit(sync_file, from_path, dest_path, link)
+            for from_path, dest_path in changed
+        ]
+        for future in futures:
+            future.result()
+    print(
+        f"   {len(changed)} copied, {len(files) - len(changed)} unchanged, "
+        f"{len(removed)} removed"
+    )
+    return changed, removed
+
+
+def find_files(source_dir_path, dest_dir_path):
+    files = []
+    for rel_path in scan_trees([source_dir_path])[0]:
+        from_path = os.path.join(source_dir_path, rel_path)
+        files.append((from_path, os.path.join(dest_dir_path, rel_path)))
+    return files
+
+
+def fingerprint_files(
+    files, dest_dir_path, assets, threads=default_copy_threads, digests=None
+):
+    if digests is None:
+        digests = {}
+    stats = {}
+    stale = []
+    for from_path, _ in files:
+        stat = os.stat(from_path)
+        stats[from_path] = [stat.st_size, stat.st_mtime_ns]
+        cached = digests.get(from_path)
+        if cached is None or cached[:2] != stats[from_path]:
+            stale.append(from_path)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for from_path, digest in zip(stale, executor.map(hash_file, stale)):
+            digests[from_path] = stats[from_path] + [digest]
+    for from_path in list(digests):
+        if from_path not in stats:
+            del digests[from_path]
+
+    fingerprinted = []
+    for from_path, dest_path in files:
+        hashed_path = fingerprint_path(dest_path, digests[from_path][2])
+        url = asset_url(dest_path, dest_dir_path)
+        assets[url] = asset_url(hashed_path, dest_dir_path)
+        fingerprinted.append((from_path, hashed_path))
+    return fingerprinted
+
+
+def fingerprint_path(path, digest):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:fingerprint_length]}{ext}"
+
+
+def asset_url(dest_path, dest_dir_path):
+    return "/" + os.path.relpath(dest_path, dest_dir_path).replace(os.sep, "/")
+
+
+def is_unchanged(from_path, dest_path, check_hash=False):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    from_stat = os.stat(from_path)
+    if from_stat.st_size != dest_stat.st_size:
+        return False
+    if not check_hash and from_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return True
+    return filecmp.cmp(from_path, dest_path, shallow=False)
+
+
+def sync_file(from_path, dest_path, link=False):
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+    if link:
+        try:
+            os.link(from_path, dest_path)
+            return
+        except OSError:
+            pass
+    copy_file_contents(from_path, dest_path)
+    shutil.copystat(from_path, dest_path)
+
+
+def copy_file_contents(from_path, dest_path):
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(from_path, dest_path)
+        return
+    with open(from_path, "rb") as from_file, open(dest_path, "wb") as to_file:
+        try:
+            while os.copy_file_range(from_file.fileno(), to_file.fileno(), 1 << 30):
+                pass
+        except OSError:
+            from_file.seek(0)
+            to_file.seek(0)
+            to_file.truncate()
+            shutil.copyfileobj(from_file, to_file)
+
+
+def copy_file(from_path, dest_path):
+    dest_dir_path = os.path.dirname(dest_path)
+    if dest_dir_path != "":
+        os.makedirs(dest_dir_path, exist_ok=True)
+    sync_file(from_path, dest_path)
@@ -0,0 +1,101 @@
+import os
+import random
+
+
+WORDS = (
+    "the ring of power was forged in the fires of mount doom by sauron "
+    "lord of mordor and hidden from the elves of eregion who had made "
+    "three rings for themselves under the stars of valinor long ago"
+).split()
+
+
+class CorpusShape:
+    def __init__(
+        self,
+        pages=100,
+        depth=2,
+        fanout=4,
+        paragraphs=8,
+        sentences=4,
+        list_items=5,
+        link_density=0.1,
+        image_density=0.02,
+        seed=0,
+    ):
+        self.pages = pages
+        self.depth = depth
+        self.fanout = fanout
+        self.paragraphs = paragraphs
+        self.sentences = sentences
+        self.list_items = list_items
+        self.link_density = link_density
+        self.image_density = image_density
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def page_rel_path(index, shape):
+    parts = []
+    for level in range(shape.depth):
+        parts.append(f"section-{(index // shape.fanout**level) % shape.fanout}")
+    parts.append(f"page-{index}")
+    return "/".join(parts)
+
+
+def make_sentence(rng, shape):
+    words = []
+    for _ in range(rng.randint(6, 14)):
+        roll = rng.random()
+        word = rng.choice(WORDS)
+        if roll < shape.link_density:
+            target = page_rel_path(rng.randrange(shape.pages), shape)
+            words.append(f"[{word}](/{target})")
+        elif roll < shape.link_density + shape.image_density:
+            words.append(f"![{word}](/images/{word}.png)")
+        elif roll < shape.link_density + shape.image_density + 0.05:
+            words.append(f"**{word}**")
+        elif roll < shape.link_density + shape.image_density + 0.08:
+            words.append(f"_{word}_")
+        elif roll < shape.link_density + shape.image_density + 0.1:
+            words.append(f"`{word}`")
+        else:
+            words.append(word)
+    return " ".join(words).capitalize() + "."
+
+
+def make_page(index, shape, rng):
+    blocks = [f"# Page {index}"]
+    for i in range(shape.paragraphs):
+        kind = i % 6
+        if kind == 1:
+            blocks.append(f"## Section {i}")
+        elif kind == 2:
+            items = [make_sentence(rng, shape) for _ in range(shape.list_items)]
+            blocks.append("\n".join(f"- {item}" for item in items))
+        elif kind == 3:
+            items = [make_sentence(rng, shape) for _ in range(shape.list_items)]
+            blocks.append(
+                "\n".join(f"{n}. {item}" for n, item in enumerate(items, start=1))
+            )
+        elif kind == 4:
+            blocks.append(f"> {make_sentence(rng, shape)}\n> {rng.choice(WORDS)}")
+        elif kind == 5:
+            blocks.append(f"```\nprint({index})\nreturn {i}\n```")
+        lines = [make_sentence(rng, shape) for _ in range(shape.sentences)]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_corpus(dir_path, shape):
+    rng = random.Random(shape.seed)
+    total_bytes = 0
+    for index in range(shape.pages):
+        path = os.path.join(dir_path, page_rel_path(index, shape), "index.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = make_page(index, shape, rng).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
+        total_bytes += len(data)
+    return total_bytes
@@ -0,0 +1,89 @@
+import os
+
+from manifest import hash_file
+
+
+FILE = "file"
+URL = "url"
+SETTING = "setting"
+
+
+def dep_key(kind, name):
+    return f"{kind}:{name}"
+
+
+def page_dependencies(from_path, template_path, references):
+    keys = [
+        dep_key(FILE, from_path),
+        dep_key(FILE, template_path),
+        dep_key(SETTING, "basepath"),
+        dep_key(SETTING, "minify"),
+    ]
+    for url in sorted(set(references)):
+        if url.startswith("/") and not url.startswith("//"):
+            keys.append(dep_key(URL, url))
+    return keys
+
+
+class BuildInputs:
+    def __init__(self, settings, dest_dir_path, outputs):
+        self.settings = settings
+        self.dest_dir_path = dest_dir_path
+        self.outputs = set(os.path.normpath(path) for path in outputs)
+        self.fingerprints = {}
+
+    def fingerprint(self, key):
+        if key not in self.fingerprints:
+            self.fingerprints[key] = self.compute(key)
+        return self.fingerprints[key]
+
+    def compute(self, key):
+        kind, name = key.split(":", 1)
+        if kind == FILE:
+            try:
+                return hash_file(name)
+            except FileNotFoundError:
+                return None
+        if kind == URL:
+            return resolve_url(name, self.dest_dir_path, self.outputs) is not None
+        if kind == SETTING:
+            return self.settings.get(name)
+        raise ValueError(f"invalid dependency: {key}")
+
+    def snapshot(self, keys):
+        return {key: self.fingerprint(key) for key in keys}
+
+
+def resolve_url(url, dest_dir_path, outputs):
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    base = os.path.normpath(os.path.join(dest_dir_path, path.lstrip("/")))
+    for candidate in (base, os.path.join(base, "index.html"), base + ".html"):
+        if candidate in outputs:
+            return candidate
+    return None
+
+
+def stale_reasons(entry, dest_path, inputs):
+    if entry is None:
+        return ["new page"]
+    if entry["dest"] != dest_path:
+        return [f"output moved from {entry['dest']}"]
+    if not os.path.exists(dest_path):
+        return ["output missing"]
+    reasons = []
+    for key, fingerprint in entry["deps"].items():
+        current = inputs.fingerprint(key)
+        if current != fingerprint:
+            reasons.append(describe_change(key, fingerprint, current))
+    return reasons
+
+
+def describe_change(key, old, new):
+    kind, name = key.split(":", 1)
+    if kind == URL:
+        return f"link target {name} {'appeared' if new else 'disappeared'}"
+    if kind == SETTING:
+        return f"{name} changed from {old!r} to {new!r}"
+    if new is None:
+        return f"{name} was removed"
+    return f"{name} changed"
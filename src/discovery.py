@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+default_scan_threads = 8
+
+PAGE = "page"
+STATIC = "static"
+
+
+def discover_tasks(
+    dir_path_content, dir_path_static, dest_dir_path, threads=default_scan_threads
+):
+    static_files, content_files = scan_trees(
+        [dir_path_static, dir_path_content], threads
+    )
+    tasks = []
+    for rel_path in static_files:
+        from_path = os.path.join(dir_path_static, rel_path)
+        tasks.append((STATIC, from_path, os.path.join(dest_dir_path, rel_path)))
+    for rel_path in content_files:
+        from_path = os.path.join(dir_path_content, rel_path)
+        dest_path = page_dest_path(os.path.join(dest_dir_path, rel_path))
+        tasks.append((PAGE, from_path, dest_path))
+    return tasks
+
+
+def tasks_of_kind(tasks, kind):
+    return [
+        (from_path, dest_path)
+        for task_kind, from_path, dest_path in tasks
+        if task_kind == kind
+    ]
+
+
+def page_dest_path(dest_path):
+    return str(Path(dest_path).with_suffix(".html"))
+
+
+def scan_trees(dir_paths, threads=default_scan_threads):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        scans = [start_scan(dir_path, executor) for dir_path in dir_paths]
+        return [finish_scan(entries, subtrees) for entries, subtrees in scans]
+
+
+def start_scan(dir_path, executor):
+    entries = sorted_entries(dir_path)
+    subtrees = {}
+    for entry in entries:
+        if entry.is_dir():
+            subtrees[entry.name] = executor.submit(scan_subtree, entry.path, entry.name)
+    return entries, subtrees
+
+
+def finish_scan(entries, subtrees):
+    rel_paths = []
+    for entry in entries:
+        if entry.name in subtrees:
+            rel_paths.extend(subtrees[entry.name].result())
+        elif entry.is_file():
+            rel_paths.append(entry.name)
+    return rel_paths
+
+
+def scan_subtree(dir_path, prefix):
+    rel_paths = []
+    for entry in sorted_entries(dir_path):
+        rel_path = os.path.join(prefix, entry.name)
+        if entry.is_file():
+            rel_paths.append(rel_path)
+        elif entry.is_dir():
+            rel_paths.extend(scan_subtree(entry.path, rel_path))
+    return rel_paths
+
+
+def sorted_entries(dir_path):
+    with os.scandir(dir_path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+
+def snapshot(path):
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return {path: (stat.st_mtime_ns, stat.st_size)}
+    files = {}
+    for dir_path, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dir_path, filename)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            files[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def diff_snapshots(old, new):
+    changed = [path for path in new if old.get(path) != new[path]]
+    removed = [path for path in old if path not in new]
+    return sorted(changed), sorted(removed)
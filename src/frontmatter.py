@@ -0,0 +1,79 @@
+import datetime
+import io
+
+
+FENCE = "---"
+LIST_KEYS = ("tags",)
+
+
+def split_front_matter(markdown):
+    f = io.StringIO(markdown)
+    meta = read_front_matter(f)
+    if f.tell() == 0:
+        return meta, markdown
+    return meta, f.read()
+
+
+def read_front_matter(f):
+    start = f.tell()
+    if f.readline().rstrip("\r\n") != FENCE:
+        f.seek(start)
+        return {}
+    lines = []
+    while True:
+        line = f.readline()
+        if line == "":
+            f.seek(start)
+            return {}
+        line = line.rstrip("\r\n")
+        if line == FENCE:
+            return parse_front_matter(lines)
+        lines.append(line)
+
+
+def parse_front_matter(lines):
+    meta = {}
+    key = None
+    for line in lines:
+        stripped = line.strip()
+        if stripped == "" or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and key in LIST_KEYS:
+            meta[key].append(unquote(stripped[2:].strip()))
+            continue
+        if ":" not in line:
+            raise ValueError(f"invalid front matter line: {line}")
+        key, value = line.split(":", 1)
+        key = key.strip()
+        meta[key] = parse_value(key, value.strip())
+    return meta
+
+
+def parse_value(key, value):
+    if key in LIST_KEYS:
+        if value.startswith("[") and value.endswith("]"):
+            value = value[1:-1]
+        return [unquote(item.strip()) for item in value.split(",") if item.strip()]
+    if key == "draft":
+        if value.lower() not in ("true", "false", "yes", "no"):
+            raise ValueError(f"invalid draft flag: {value}")
+        return value.lower() in ("true", "yes")
+    if key == "date":
+        try:
+            return datetime.date.fromisoformat(unquote(value)).isoformat()
+        except ValueError:
+            raise ValueError(f"invalid date: {value}")
+    return unquote(value)
+
+
+def unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def find_heading(lines):
+    for line in lines:
+        if line.startswith("# "):
+            return line[2:].rstrip("\n")
+    return None
@@ -1,48 +1,439 @@
+import json
 import os
-from pathlib import Path
-from markdown_blocks import markdown_to_html_node
+import time
+from concurrent.futures import ProcessPoolExecutor
+import htmlnode
+import inline_markdown
+from depgraph import BuildInputs, page_dependencies, stale_reasons
+from discovery import page_dest_path, scan_trees
+from frontmatter import find_heading, read_front_matter, split_front_matter
+from linkindex import LinkIndex
+from listings import default_page_size, plan_listings
+from manifest import hash_bytes
+from markdown_blocks import iter_block_nodes, markdown_to_html_node
+from pageindex import PageIndex
+from profiler import Profiler, profile_iter, profile_stage, profiling
+from template import load_template
+from writer import ChangeSet, OutputWriter, write_file
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
-    for filename in os.listdir(dir_path_content):
-        from_path = os.path.join(dir_path_content, filename)
-        dest_path = os.path.join(dest_dir_path, filename)
-        if os.path.isfile(from_path):
-            dest_path = Path(dest_path).with_suffix(".html")
-            generate_page(from_path, template_path, dest_path, basepath)
-        else:
-            generate_pages_recursive(from_path, template_path, dest_path, basepath)
+def generate_pages_recursive(
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    basepath,
+    *,
+    manifest=None,
+    jobs=1,
+    ast_cache=None,
+    profiler=None,
+    inline_cache_bytes=inline_markdown.default_inline_cache_bytes,
+    pages=None,
+    explain=False,
+    page_index=None,
+    drafts=False,
+    page_size=default_page_size,
+    minify=False,
+    assets=None,
+    changes=None,
+):
+    if changes is None:
+        changes = ChangeSet()
+    if pages is None:
+        pages = find_pages(dir_path_content, dest_dir_path)
+    if page_index is None:
+        page_index = PageIndex()
+    with profile_stage("page index"):
+        page_index.refresh(pages)
+    if not drafts:
+        pages = [page for page in pages if not page_index.get(page[0]).draft]
+    listings = []
+    taken = [dest_path for _, dest_path in pages]
+    entries = [page_index.get(from_path) for from_path, _ in pages]
+    entries = [entry for entry in entries if entry.title is not None]
+    if page_size > 0:
+        listings = plan_listings(entries, dest_dir_path, page_size, taken)
+    if manifest is not None:
+        outputs = [dest_path for _, dest_path in pages] + manifest.static
+        outputs.extend(listing.dest_path for listing in listings)
+        settings = {"basepath": basepath, "minify": minify}
+        inputs = BuildInputs(settings, dest_dir_path, outputs)
+        stale_pages = []
+        for from_path, dest_path in pages:
+            reasons = stale_reasons(manifest.pages.get(from_path), dest_path, inputs)
+            if reasons:
+                stale_pages.append((from_path, dest_path))
+                if explain:
+                    print(f" * rebuilding {from_path}: {'; '.join(reasons)}")
+        print(f" * {len(stale_pages)} of {len(pages)} pages out of date")
+        live_sources = set(from_path for from_path, _ in pages)
+        for dest_path in manifest.prune(live_sources):
+            if remove_page(dest_path, dest_dir_path):
+                changes.deleted([dest_path])
+        pages = stale_pages
 
+    template = load_template(template_path, basepath, minify, assets)
+    renderer = PageRenderer(
+        template, basepath, ast_cache, profiler is not None, inline_cache_bytes
+    )
+    failed, references, written = render_pages(pages, renderer, jobs, profiler)
+    changes.wrote(written)
+    if failed and page_size > 0:
+        entries = [entry for entry in entries if entry.from_path not in failed]
+        listings = plan_listings(entries, dest_dir_path, page_size, taken)
 
-def generate_page(from_path, template_path, dest_path, basepath):
-    print(f" * {from_path} {template_path} -> {dest_path}")
-    from_file = open(from_path, "r")
-    markdown_content = from_file.read()
-    from_file.close()
+    link_index = LinkIndex(dest_dir_path)
+    if manifest is not None:
+        for from_path, dest_path in pages:
+            if from_path not in failed:
+                links = references[from_path]
+                keys = page_dependencies(
+                    from_path, template_path, links + template.references
+                )
+                manifest.record(from_path, dest_path, inputs.snapshot(keys), links)
+        for from_path, entry in manifest.pages.items():
+            link_index.add(from_path, entry["dest"], entry.get("links", []))
+    else:
+        for from_path, dest_path in pages:
+            if from_path not in failed:
+                link_index.add(from_path, dest_path, references[from_path])
+    generate_listings(
+        listings, template, basepath, manifest, dest_dir_path, changes, taken
+    )
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(pages)} pages failed to render")
+    return link_index
 
-    template_file = open(template_path, "r")
-    template = template_file.read()
-    template_file.close()
 
-    node = markdown_to_html_node(markdown_content)
-    html = node.to_html()
+def generate_listings(
+    listings,
+    template,
+    basepath,
+    manifest=None,
+    dest_dir_path="",
+    changes=None,
+    taken=(),
+):
+    if changes is None:
+        changes = ChangeSet()
+    previous = {} if manifest is None else manifest.generated
+    settings = json.dumps([template.literals, template.names, basepath])
+    generated = {}
+    regenerated = 0
+    collapsed = htmlnode.minify_stats.bytes_saved
+    for listing in listings:
+        digest = hash_bytes(f"{settings}{listing.signature()}".encode("utf-8"))
+        generated[listing.dest_path] = digest
+        if previous.get(listing.dest_path) == digest:
+            if os.path.exists(listing.dest_path):
+                continue
+        print(f" * generating {listing.dest_path}")
+        node = listing.to_html_node()
+        apply_basepath(node, basepath, template.assets)
+        variables = {"Title": listing.title}
+        if write_page(variables, node, template, listing.dest_path):
+            changes.wrote([listing.dest_path])
+        regenerated += 1
+    taken = set(os.path.normpath(path) for path in taken)
+    for dest_path in previous:
+        if dest_path not in generated and os.path.normpath(dest_path) not in taken:
+            if remove_page(dest_path, dest_dir_path):
+                changes.deleted([dest_path])
+    if manifest is not None:
+        manifest.generated = generated
+    if listings:
+        print(f"   {len(listings)} listing pages, {regenerated} regenerated")
+    if template.minify and regenerated:
+        collapsed = htmlnode.minify_stats.bytes_saved - collapsed
+        bytes_saved = collapsed + template.saved * regenerated
+        print(f"   minify: {bytes_saved} bytes saved over {regenerated} listing pages")
 
-    title = extract_title(markdown_content)
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html)
-    template = template.replace('href="/', 'href="' + basepath)
-    template = template.replace('src="/', 'src="' + basepath)
 
-    dest_dir_path = os.path.dirname(dest_path)
-    if dest_dir_path != "":
-        os.makedirs(dest_dir_path, exist_ok=True)
-    to_file = open(dest_path, "w")
-    to_file.write(template)
+class PageRenderer:
+    def __init__(
+        self,
+        template,
+        basepath,
+        ast_cache=None,
+        profile=False,
+        inline_cache_bytes=inline_markdown.default_inline_cache_bytes,
+    ):
+        self.template = template
+        self.basepath = basepath
+        self.ast_cache = ast_cache
+        self.profile = profile
+        self.inline_cache_bytes = inline_cache_bytes
+        self.writer = None
+
+    def render(self, page):
+        from_path, dest_path = page
+        result = {"error": None, "references": []}
+        inline_cache = inline_markdown.configure_inline_cache(self.inline_cache_bytes)
+        if inline_cache is not None:
+            hits, misses = inline_cache.hits, inline_cache.misses
+        bytes_saved = htmlnode.minify_stats.bytes_saved
+        page_profiler = Profiler() if self.profile else None
+        start = time.perf_counter()
+        writer = self.writer
+        if writer is None:
+            writer = OutputWriter(threads=0)
+        try:
+            with profiling(page_profiler):
+                result["references"] = generate_page(
+                    from_path,
+                    self.template,
+                    dest_path,
+                    self.basepath,
+                    self.ast_cache,
+                    writer,
+                )
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        if writer is not self.writer:
+            result["written"] = writer.written
+        if self.template.minify and result["error"] is None:
+            bytes_saved = htmlnode.minify_stats.bytes_saved - bytes_saved
+            result["minified"] = bytes_saved + self.template.saved
+        if page_profiler is not None:
+            page_profiler.add_page(from_path, time.perf_counter() - start)
+            result["profile"] = page_profiler.to_dict()
+        if inline_cache is not None:
+            result["inline_cache"] = (
+                inline_cache.hits - hits,
+                inline_cache.misses - misses,
+            )
+        return result
+
+
+def render_pages(pages, renderer, jobs=1, profiler=None):
+    if jobs > 1 and len(pages) > 1:
+        chunksize = max(1, len(pages) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(renderer.render, pages, chunksize=chunksize)
+            return report_results(pages, results, renderer.template, profiler)
+    writer = OutputWriter()
+    renderer.writer = writer
+    try:
+        results = map(renderer.render, pages)
+        failed, references, written = report_results(
+            pages, results, renderer.template, profiler
+        )
+    finally:
+        renderer.writer = None
+        write_errors = writer.close()
+    for from_path, dest_path in pages:
+        if dest_path in write_errors:
+            print(f" * {from_path} -> {dest_path}")
+            print(f"   ! {write_errors[dest_path]}")
+            failed[from_path] = write_errors[dest_path]
+    return failed, references, written + writer.written
+
+
+def report_results(pages, results, template, profiler=None):
+    failed = {}
+    references = {}
+    written = []
+    cache_hits = 0
+    cache_misses = 0
+    bytes_saved = 0
+    minified = 0
+    for (from_path, dest_path), result in zip(pages, results):
+        print(f" * {from_path} {template.path} -> {dest_path}")
+        if result["error"] is not None:
+            print(f"   ! {result['error']}")
+            failed[from_path] = result["error"]
+        references[from_path] = result["references"]
+        written.extend(result.get("written", []))
+        if profiler is not None:
+            profiler.merge(result["profile"])
+        if "inline_cache" in result:
+            cache_hits += result["inline_cache"][0]
+            cache_misses += result["inline_cache"][1]
+        if "minified" in result:
+            bytes_saved += result["minified"]
+            minified += 1
+    if cache_hits + cache_misses > 0:
+        rate = cache_hits / (cache_hits + cache_misses) * 100
+        print(
+            f"   inline cache: {cache_hits} hits, {cache_misses} misses ({rate:.1f}%)"
+        )
+    if minified > 0:
+        print(f"   minify: {bytes_saved} bytes saved over {minified} pages")
+    return failed, references, written
+
+
+def find_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for rel_path in scan_trees([dir_path_content])[0]:
+        from_path = os.path.join(dir_path_content, rel_path)
+        dest_path = page_dest_path(os.path.join(dest_dir_path, rel_path))
+        pages.append((from_path, dest_path))
+    return pages
+
+
+def remove_page(dest_path, dest_dir_path):
+    print(f" * removing {dest_path}")
+    removed = os.path.exists(dest_path)
+    if removed:
+        os.remove(dest_path)
+    dest_dir_path = os.path.normpath(dest_dir_path)
+    dir_path = os.path.dirname(os.path.normpath(dest_path))
+    while dir_path != dest_dir_path and dir_path.startswith(dest_dir_path):
+        if os.path.isdir(dir_path):
+            if os.listdir(dir_path):
+                break
+            os.rmdir(dir_path)
+        dir_path = os.path.dirname(dir_path)
+    return removed
+
+
+def remove_orphans(dest_dir_path, live_paths):
+    if not os.path.isdir(dest_dir_path):
+        return []
+    live_paths = set(os.path.normpath(path) for path in live_paths)
+    removed = []
+    for rel_path in scan_trees([dest_dir_path])[0]:
+        dest_path = os.path.join(dest_dir_path, rel_path)
+        if os.path.normpath(dest_path) not in live_paths:
+            remove_page(dest_path, dest_dir_path)
+            removed.append(dest_path)
+    return removed
+
+
+stream_threshold = 16 * 1024 * 1024
+
+
+def generate_page(
+    from_path, template, dest_path, basepath, ast_cache=None, writer=None
+):
+    if os.path.getsize(from_path) >= stream_threshold:
+        references = set()
+        with profile_stage("stream"):
+            generate_page_streaming(
+                from_path, template, dest_path, basepath, references, writer
+            )
+        return sorted(references)
+    variables, node = load_page(from_path, basepath, ast_cache, template.assets)
+    write_page(variables, node, template, dest_path, writer)
+    return find_references(node, basepath)
+
+
+def generate_page_streaming(
+    from_path, template, dest_path, basepath, references=None, writer=None
+):
+    with open(from_path, "r") as from_file:
+        meta = read_front_matter(from_file)
+        title = meta.get("title")
+        body_start = from_file.tell()
+        if title is None:
+            title = find_title(from_file)
+        from_file.seek(body_start)
+        content = iter_content_html(
+            from_file, basepath, references, template.minify, template.assets
+        )
+        variables = page_variables(title, meta)
+        chunks = template.render_iter({**variables, "Content": content})
+        if writer is None:
+            return write_file(dest_path, chunks)
+        writer.write(dest_path, chunks, stream=True)
+
+
+def iter_content_html(lines, basepath, references=None, minify=False, assets=None):
+    yield "<div>"
+    for node in iter_block_nodes(lines):
+        apply_basepath(node, basepath, assets)
+        if references is not None:
+            references.update(find_references(node, basepath))
+        yield from node.to_html_iter(minify)
+    yield "</div>"
+
+
+def load_page(from_path, basepath, ast_cache=None, assets=None):
+    with profile_stage("read"):
+        from_file = open(from_path, "rb")
+        data = from_file.read()
+        from_file.close()
+        meta, markdown_content = split_front_matter(data.decode("utf-8"))
+
+    with profile_stage("parse"):
+        node = None
+        if ast_cache is not None:
+            digest = hash_bytes(data)
+            node = ast_cache.get(digest)
+        if node is None:
+            node = markdown_to_html_node(markdown_content)
+            if ast_cache is not None:
+                ast_cache.put(digest, node)
+        apply_basepath(node, basepath, assets)
+    title = meta.get("title")
+    if title is None:
+        title = extract_title(markdown_content)
+    return page_variables(title, meta), node
+
+
+def page_variables(title, meta):
+    variables = {}
+    for key, value in meta.items():
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, list):
+            value = ", ".join(value)
+        variables[key[:1].upper() + key[1:]] = value
+    variables["Title"] = title
+    return variables
+
+
+def write_page(variables, node, template, dest_path, writer=None):
+    content = profile_iter("to_html", node.to_html_iter(template.minify))
+    chunks = template.render_iter({**variables, "Content": content})
+    chunks = profile_iter("template fill", chunks)
+    with profile_stage("write"):
+        if writer is None:
+            return write_file(dest_path, chunks)
+        writer.write(dest_path, chunks)
+
+
+def apply_basepath(node, basepath, assets=None):
+    if basepath == "/" and not assets:
+        return
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.props is not None:
+            for name in ("href", "src"):
+                url = node.props.get(name)
+                if url is not None and url.startswith("/"):
+                    if assets:
+                        url = assets.get(url, url)
+                    node.props[name] = basepath + url[1:]
+        if node.children is not None:
+            stack.extend(node.children)
+
+
+def find_references(node, basepath):
+    references = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.props is not None:
+            for name in ("href", "src"):
+                url = node.props.get(name)
+                if url is None:
+                    continue
+                if url.startswith(basepath):
+                    url = "/" + url[len(basepath) :]
+                references.append(url)
+        if node.children is not None:
+            stack.extend(node.children)
+    return references
 
 
 def extract_title(md):
-    lines = md.split("\n")
-    for line in lines:
-        if line.startswith("# "):
-            return line[2:]
-    raise ValueError("no title found")
+    return find_title(md.split("\n"))
+
+
+def find_title(lines):
+    title = find_heading(lines)
+    if title is None:
+        raise ValueError("no title found")
+    return title
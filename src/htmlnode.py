@@ -1,53 +1,95 @@
+import re
+
+
+HTML_WHITESPACE = re.compile(r"[ \t\n\r\f]{2,}|[\t\n\r\f]")
+PRESERVE_TAGS = frozenset(("pre", "code", "textarea", "script", "style"))
+
+
+class MinifyStats:
+    __slots__ = ("bytes_saved",)
+
+    def __init__(self):
+        self.bytes_saved = 0
+
+    def collapse(self, text):
+        collapsed = HTML_WHITESPACE.sub(" ", text)
+        self.bytes_saved += len(text) - len(collapsed)
+        return collapsed
+
+
+minify_stats = MinifyStats()
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
         self.children = children
         self.props = props
 
-    def to_html(self):
+    def to_html(self, minify=False):
+        return "".join(self.to_html_iter(minify))
+
+    def to_html_iter(self, minify=False):
         raise NotImplementedError("to_html method not implemented")
 
+    def write_html(self, fp, minify=False):
+        fp.writelines(self.to_html_iter(minify))
+
     def props_to_html(self):
         if self.props is None:
             return ""
-        props_html = ""
-        for prop in self.props:
-            props_html += f' {prop}="{self.props[prop]}"'
-        return props_html
+        return "".join(f' {prop}="{value}"' for prop, value in self.props.items())
 
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, children: {self.children}, {self.props})"
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
-    def to_html(self):
+    def to_html(self, minify=False):
         if self.value is None:
             raise ValueError("invalid HTML: no value")
+        value = self.value
+        if minify and self.tag not in PRESERVE_TAGS:
+            value = minify_stats.collapse(value)
         if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return value
+        return f"<{self.tag}{self.props_to_html()}>{value}</{self.tag}>"
+
+    def to_html_iter(self, minify=False):
+        yield self.to_html(minify)
 
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def to_html_iter(self, minify=False):
         if self.tag is None:
             raise ValueError("invalid HTML: no tag")
         if self.children is None:
             raise ValueError("invalid HTML: no children")
-        children_html = ""
+        if self.tag in PRESERVE_TAGS:
+            minify = False
+        yield f"<{self.tag}{self.props_to_html()}>"
         for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+            if isinstance(child, LeafNode):
+                yield child.to_html(minify)
+            else:
+                yield from child.to_html_iter(minify)
+        yield f"</{self.tag}>"
 
     def __repr__(self):
         return f"ParentNode({self.tag}, children: {self.children}, {self.props})"
@@ -1,18 +1,119 @@
 import re
+import sys
+from collections import OrderedDict
 
 from textnode import TextNode, TextType
 
 
+default_inline_cache_bytes = 32 * 1024 * 1024
+
+
+INLINE_PATTERN = re.compile(
+    r"!\[(?P<image_alt>[^\[\]]*)\]\((?P<image>[^\(\)]*)\)"
+    r"|\[(?P<link_text>[^\[\]]*)\]\((?P<link>[^\(\)]*)\)"
+    r"|\*\*(?P<bold>.*?)\*\*"
+    r"|_(?P<italic>[^_]*)_"
+    r"|`(?P<code>[^`]*)`"
+)
+
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+# match.lastgroup -> (text type, group holding the node text for url spans)
+SPAN_TYPES = {
+    "image": (TextType.IMAGE, "image_alt"),
+    "link": (TextType.LINK, "link_text"),
+    "bold": (TextType.BOLD, None),
+    "italic": (TextType.ITALIC, None),
+    "code": (TextType.CODE, None),
+}
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    nodes = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            nodes.append(plain_text_node(text[position : match.start()]))
+        kind = match.lastgroup
+        text_type, text_group = SPAN_TYPES[kind]
+        if text_group is not None:
+            nodes.append(TextNode(match[text_group], text_type, match[kind]))
+        elif match[kind] != "":
+            nodes.append(TextNode(match[kind], text_type))
+        position = match.end()
+    if position < len(text):
+        nodes.append(plain_text_node(text[position:]))
     return nodes
 
 
+def plain_text_node(text):
+    if "**" in text or "_" in text or "`" in text:
+        raise ValueError("invalid markdown, formatted section not closed")
+    return TextNode(text, TextType.TEXT)
+
+
+class InlineCache:
+    def __init__(self, max_bytes=default_inline_cache_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def text_to_textnodes(self, text):
+        entry = self.entries.get(text)
+        if entry is not None:
+            self.entries.move_to_end(text)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        nodes = tuple(text_to_textnodes(text))
+        size = entry_size(text, nodes)
+        if size <= self.max_bytes:
+            self.entries[text] = (nodes, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+        return nodes
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+
+def entry_size(text, nodes):
+    # the key plus roughly one more copy of its characters spread over the
+    # node texts and urls, a slotted TextNode per node and the dict entry
+    return 2 * sys.getsizeof(text) + 72 * len(nodes) + 160
+
+
+inline_cache = InlineCache()
+
+
+def configure_inline_cache(max_bytes):
+    global inline_cache
+    if max_bytes <= 0:
+        inline_cache = None
+    elif inline_cache is None or inline_cache.max_bytes != max_bytes:
+        inline_cache = InlineCache(max_bytes)
+    return inline_cache
+
+
+def cached_text_to_textnodes(text):
+    if inline_cache is None:
+        return text_to_textnodes(text)
+    return inline_cache.text_to_textnodes(text)
+
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
     for old_node in old_nodes:
@@ -89,12 +190,8 @@ def split_nodes_link(old_nodes):
 
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)
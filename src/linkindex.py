@@ -0,0 +1,92 @@
+import json
+import os
+from urllib.parse import urljoin, urlsplit
+
+from depgraph import resolve_url
+
+
+class LinkIndex:
+    def __init__(self, dest_dir_path):
+        self.dest_dir_path = dest_dir_path
+        self.pages = {}
+
+    def add(self, from_path, dest_path, references):
+        page_url = output_url(dest_path, self.dest_dir_path)
+        self.pages[page_url] = {"source": from_path, "links": list(references)}
+
+    def link_count(self):
+        return sum(len(page["links"]) for page in self.pages.values())
+
+    def resolve_all(self, outputs):
+        outputs = set(os.path.normpath(path) for path in outputs)
+        resolved = {}
+        for page_url, page in self.pages.items():
+            for url in page["links"]:
+                target = resolve_link(page_url, url)
+                if target is not None and target not in resolved:
+                    resolved[target] = resolve_url(target, self.dest_dir_path, outputs)
+        return resolved
+
+    def validate(self, outputs):
+        resolved = self.resolve_all(outputs)
+        broken = []
+        for page_url, page in self.pages.items():
+            for url in page["links"]:
+                target = resolve_link(page_url, url)
+                if target is not None and resolved[target] is None:
+                    broken.append((page["source"], url))
+        return broken
+
+    def to_dict(self, outputs):
+        resolved = self.resolve_all(outputs)
+        pages = {}
+        for page_url, page in sorted(self.pages.items()):
+            internal = set()
+            external = set()
+            broken = set()
+            for url in page["links"]:
+                target = resolve_link(page_url, url)
+                if target is None:
+                    if is_external(url):
+                        external.add(url)
+                elif resolved[target] is None:
+                    broken.add(url)
+                else:
+                    internal.add(output_url(resolved[target], self.dest_dir_path))
+            pages[page_url] = {
+                "source": page["source"],
+                "links": sorted(internal),
+                "external": sorted(external),
+                "broken": sorted(broken),
+            }
+        return {"pages": pages}
+
+    def save(self, path, outputs):
+        dir_path = os.path.dirname(path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(outputs), f, indent=1)
+
+
+def output_url(dest_path, dest_dir_path):
+    rel_path = os.path.relpath(dest_path, dest_dir_path).replace(os.sep, "/")
+    if rel_path == "index.html":
+        return "/"
+    if rel_path.endswith("/index.html"):
+        return "/" + rel_path[: -len("index.html")]
+    return "/" + rel_path
+
+
+def is_external(url):
+    parts = urlsplit(url)
+    return parts.scheme != "" or parts.netloc != ""
+
+
+def resolve_link(page_url, url):
+    if is_external(url):
+        return None
+    path = urlsplit(url).path
+    if path == "":
+        return None
+    return urljoin(page_url, path)
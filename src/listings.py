@@ -0,0 +1,133 @@
+import json
+import os
+import posixpath
+import re
+
+from htmlnode import LeafNode, ParentNode
+from linkindex import output_url
+
+
+default_page_size = 10
+tags_url = "/tags/"
+
+
+class Listing:
+    __slots__ = ("url", "dest_path", "title", "posts", "tags", "newer", "older")
+
+    def __init__(self, url, dest_path, title, posts=None, tags=None):
+        self.url = url
+        self.dest_path = dest_path
+        self.title = title
+        self.posts = posts
+        self.tags = tags
+        self.newer = None
+        self.older = None
+
+    def signature(self):
+        return json.dumps([self.title, self.posts, self.tags, self.newer, self.older])
+
+    def to_html_node(self):
+        children = [ParentNode("h1", [LeafNode(None, self.title)])]
+        items = []
+        if self.posts is not None:
+            for title, url, date in self.posts:
+                link = LeafNode("a", title, {"href": url})
+                time = LeafNode("time", date)
+                items.append(ParentNode("li", [link, LeafNode(None, " "), time]))
+        if self.tags is not None:
+            for tag, url, count in self.tags:
+                link = LeafNode("a", tag, {"href": url})
+                items.append(ParentNode("li", [link, LeafNode(None, f" ({count})")]))
+        if items:
+            children.append(ParentNode("ul", items))
+        nav = []
+        if self.newer is not None:
+            nav.append(LeafNode("a", "< Newer", {"href": self.newer}))
+        if self.older is not None:
+            nav.append(LeafNode("a", "Older >", {"href": self.older}))
+        if nav:
+            children.append(ParentNode("nav", nav))
+        return ParentNode("div", children)
+
+
+def plan_listings(entries, dest_dir_path, page_size=default_page_size, taken=()):
+    posts = [entry for entry in entries if entry.date is not None]
+    posts.sort(key=lambda entry: entry.title or "")
+    posts.sort(key=lambda entry: entry.date, reverse=True)
+
+    sections = {}
+    tags = {}
+    for entry in posts:
+        url = output_url(entry.dest_path, dest_dir_path)
+        post = (entry.title, url, entry.date)
+        section = posixpath.dirname(url.rstrip("/")).rstrip("/") + "/"
+        if section != "/":
+            sections.setdefault(section, []).append(post)
+        for tag in entry.tags:
+            tags.setdefault(tag, []).append(post)
+
+    taken = set(os.path.normpath(path) for path in taken)
+    listings = []
+    for section, section_posts in sorted(sections.items()):
+        title = section_title(section)
+        pages = paginate(section, title, section_posts, page_size, dest_dir_path)
+        if os.path.normpath(pages[0].dest_path) not in taken:
+            listings.extend(pages)
+    if tags:
+        tag_rows = []
+        slugs = tag_slugs(tags)
+        for tag in sorted(tags):
+            url = f"{tags_url}{slugs[tag]}/"
+            tag_rows.append((tag, url, len(tags[tag])))
+            title = f"Posts tagged {tag}"
+            listings.extend(paginate(url, title, tags[tag], page_size, dest_dir_path))
+        dest_path = url_dest_path(tags_url, dest_dir_path)
+        if os.path.normpath(dest_path) not in taken:
+            listings.append(Listing(tags_url, dest_path, "Tags", tags=tag_rows))
+    return listings
+
+
+def paginate(base_url, title, posts, page_size, dest_dir_path):
+    pages = []
+    for start in range(0, len(posts), page_size):
+        number = start // page_size + 1
+        url = base_url if number == 1 else f"{base_url}page/{number}/"
+        page_title = title if number == 1 else f"{title} (page {number})"
+        dest_path = url_dest_path(url, dest_dir_path)
+        page = Listing(url, dest_path, page_title, posts[start : start + page_size])
+        if pages:
+            page.newer = pages[-1].url
+            pages[-1].older = url
+        pages.append(page)
+    return pages
+
+
+def url_dest_path(url, dest_dir_path):
+    dest_path = os.path.join(dest_dir_path, url.strip("/"), "index.html")
+    return os.path.normpath(dest_path)
+
+
+def section_title(section):
+    name = section.strip("/").split("/")[-1]
+    return name.replace("-", " ").replace("_", " ").title()
+
+
+def tag_slugs(tags):
+    slugs = {}
+    used = set()
+    for tag in sorted(tags):
+        base = slugify(tag)
+        if base == "":
+            raise ValueError(f"tag {tag!r} has no characters usable in a URL")
+        slug = base
+        number = 1
+        while slug in used:
+            number += 1
+            slug = f"{base}-{number}"
+        used.add(slug)
+        slugs[tag] = slug
+    return slugs
+
+
+def slugify(tag):
+    return re.sub(r"[^a-z0-9]+", "-", tag.lower()).strip("-")
@@ -1,32 +1,245 @@
+import argparse
 import os
-import shutil
-import sys
 
-from copystatic import copy_files_recursive
-from gencontent import generate_pages_recursive
+from astcache import ASTCache
+from compress import Compressor, default_min_size
+from copystatic import sync_files_recursive
+from discovery import PAGE, STATIC, discover_tasks, tasks_of_kind
+from gencontent import generate_pages_recursive, remove_orphans
+from listings import default_page_size
+from inline_markdown import default_inline_cache_bytes
+from manifest import Manifest
+from pageindex import PageIndex
+from profiler import Profiler, profile_stage, profiling
+from writer import ChangeSet
 
 
 dir_path_static = "./static"
 dir_path_public = "./docs"
 dir_path_content = "./content"
 template_path = "./template.html"
+manifest_path = "./.buildcache/manifest.json"
+page_index_path = "./.buildcache/pages.json"
+ast_cache_path = "./.buildcache/ast"
+profile_path = "./.buildcache/profile.json"
+changes_path = "./.buildcache/changes.json"
+compressed_path = "./.buildcache/compressed.json"
+link_graph_path = "./.buildcache/links.json"
 default_basepath = "/"
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the static site.")
+    parser.add_argument("basepath", nargs="?", default=default_basepath)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-render pages whose markdown, template or basepath changed",
+    )
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also render pages marked draft: true in their front matter",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=default_page_size,
+        help="posts per generated section, tag and archive page (0 disables them)",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="print which inputs changed for every page that is re-rendered",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to render pages (0 = one per core)",
+    )
+    parser.add_argument(
+        "--hash-static",
+        action="store_true",
+        help="compare static files by content hash instead of size and mtime",
+    )
+    parser.add_argument(
+        "--link-static",
+        action="store_true",
+        help="hardlink static files into the public directory where possible",
+    )
+    parser.add_argument(
+        "--ast-cache-size",
+        type=int,
+        default=256,
+        help="size limit of the parsed-markdown cache in MB (0 disables it)",
+    )
+    parser.add_argument(
+        "--inline-cache-size",
+        type=int,
+        default=default_inline_cache_bytes // (1024 * 1024),
+        help="memory cap of the rendered inline fragment cache in MB (0 disables it)",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="copy static files under content-hashed names and rewrite references",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="collapse whitespace in pages and the template (pre/code kept as is)",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="write .gz (and .br when brotli is installed) next to text outputs",
+    )
+    parser.add_argument(
+        "--compress-min-size",
+        type=int,
+        default=default_min_size,
+        help="smallest output in bytes that gets compressed",
+    )
+    parser.add_argument(
+        "--strict-links",
+        action="store_true",
+        help="fail the build when a page links to a missing page or static file",
+    )
+    parser.add_argument(
+        "--link-graph",
+        nargs="?",
+        const=link_graph_path,
+        default=None,
+        metavar="JSON",
+        help=f"write the site link graph as JSON (default {link_graph_path})",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=profile_path,
+        default=None,
+        metavar="JSON",
+        help=f"time each build stage and page, writing JSON (default {profile_path})",
+    )
+    return parser.parse_args()
+
+
 def main():
-    basepath = default_basepath
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+    args = parse_args()
+    basepath = args.basepath
+    jobs = args.jobs or os.cpu_count()
+    ast_cache = None
+    if args.ast_cache_size > 0:
+        ast_cache = ASTCache(ast_cache_path, args.ast_cache_size * 1024 * 1024)
+    profiler = None
+    if args.profile is not None:
+        profiler = Profiler()
+
+    manifest = Manifest(manifest_path)
+    manifest.load()
+    if not args.incremental:
+        manifest.forget_pages()
+    page_index = PageIndex(page_index_path)
+    compressor = Compressor(compressed_path, args.compress_min_size)
+    compressor.load()
+    changes = ChangeSet()
+    changes.load(changes_path, dir_path_public)
+    assets = {} if args.fingerprint else None
+
+    complete = False
+    try:
+        with profiling(profiler):
+            with profile_stage("discovery"):
+                tasks = discover_tasks(
+                    dir_path_content, dir_path_static, dir_path_public
+                )
+
+            print("Copying static files to public directory...")
+            with profile_stage("static sync"):
+                copied, removed = sync_files_recursive(
+                    dir_path_static,
+                    dir_path_public,
+                    manifest,
+                    check_hash=args.hash_static,
+                    link=args.link_static,
+                    files=tasks_of_kind(tasks, STATIC),
+                    assets=assets,
+                )
+            changes.wrote(dest_path for _, dest_path in copied)
+            changes.deleted(removed)
+            manifest.assets = {} if assets is None else assets
 
-    print("Deleting public directory...")
-    if os.path.exists(dir_path_public):
-        shutil.rmtree(dir_path_public)
+            print("Generating content...")
+            compressed = False
+            try:
+                link_index = generate_pages_recursive(
+                    dir_path_content,
+                    template_path,
+                    dir_path_public,
+                    basepath,
+                    manifest=manifest,
+                    jobs=jobs,
+                    ast_cache=ast_cache,
+                    profiler=profiler,
+                    inline_cache_bytes=args.inline_cache_size * 1024 * 1024,
+                    pages=tasks_of_kind(tasks, PAGE),
+                    explain=args.explain,
+                    page_index=page_index,
+                    drafts=args.drafts,
+                    page_size=args.page_size,
+                    minify=args.minify,
+                    assets=assets,
+                    changes=changes,
+                )
+                if args.compress:
+                    print("Compressing output files...")
+                    with profile_stage("compress"):
+                        updated, total = compressor.compress_outputs(
+                            manifest.outputs(), changes
+                        )
+                    print(f"   {total} files compressed, {updated} updated")
+                    compressed = True
+                if not args.incremental:
+                    print("Removing stale files from public directory...")
+                    outputs = manifest.outputs() + compressor.outputs()
+                    changes.deleted(remove_orphans(dir_path_public, outputs))
+            finally:
+                if not compressed:
+                    touched = changes.changed | changes.removed
+                    stale = compressor.discard(touched, changes)
+                    if stale:
+                        print(f"   {len(stale)} stale compressed files removed")
+                manifest.save()
+                page_index.save()
+                compressor.save()
+                if ast_cache is not None:
+                    ast_cache.evict()
 
-    print("Copying static files to public directory...")
-    copy_files_recursive(dir_path_static, dir_path_public)
+            print("Checking links...")
+            with profile_stage("link check"):
+                outputs = manifest.outputs()
+                broken = link_index.validate(outputs)
+                if args.link_graph is not None:
+                    link_index.save(args.link_graph, outputs)
+            for from_path, url in broken:
+                print(f"   ! {from_path}: broken link {url}")
+            print(f"   {link_index.link_count()} links checked, {len(broken)} broken")
+            if args.link_graph is not None:
+                print(f"Link graph written to {args.link_graph}")
+            if broken and args.strict_links:
+                raise RuntimeError(f"{len(broken)} broken links")
+        complete = True
+    finally:
+        changed, removed = changes.save(changes_path, dir_path_public, complete)
+    print(f"{len(changed)} files changed, {len(removed)} removed ({changes_path})")
 
-    print("Generating content...")
-    generate_pages_recursive(dir_path_content, template_path, dir_path_public, basepath)
+    if profiler is not None:
+        profiler.report()
+        profiler.save(args.profile)
+        print(f"Profile written to {args.profile}")
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+
+
+MANIFEST_VERSION = 3
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        self.static = []
+        self.generated = {}
+        self.assets = {}
+        self.digests = {}
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        self.pages = data["pages"]
+        self.static = data.get("static", [])
+        self.generated = data.get("generated", {})
+        self.assets = data.get("assets", {})
+        self.digests = data.get("digests", {})
+
+    def save(self):
+        dir_path = os.path.dirname(self.path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "pages": self.pages,
+            "static": self.static,
+            "generated": self.generated,
+            "assets": self.assets,
+            "digests": self.digests,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def forget_pages(self):
+        self.pages = {}
+        self.generated = {}
+
+    def record(self, from_path, dest_path, deps, links=()):
+        self.pages[from_path] = {"dest": dest_path, "deps": deps, "links": list(links)}
+
+    def outputs(self):
+        pages = [entry["dest"] for entry in self.pages.values()]
+        return pages + self.static + list(self.generated)
+
+    def prune(self, live_sources):
+        removed = []
+        for from_path in list(self.pages):
+            if from_path not in live_sources:
+                removed.append(self.pages.pop(from_path)["dest"])
+        return removed
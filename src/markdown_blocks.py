@@ -1,10 +1,13 @@
 from enum import Enum
 
 from htmlnode import ParentNode
-from inline_markdown import text_to_textnodes
+from inline_markdown import cached_text_to_textnodes
 from textnode import text_node_to_html_node, TextNode, TextType
 
 
+PARSER_VERSION = 3
+
+
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
     HEADING = "heading"
@@ -15,34 +18,63 @@ class BlockType(Enum):
 
 
 def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
+    return ["\n".join(lines) for _, lines in iter_blocks(markdown.split("\n"))]
+
+
+def iter_blocks(lines):
+    block = []
+    in_fence = False
+    for line in lines:
+        line = line.rstrip("\n")
+        if not block:
+            line = line.lstrip()
+            if line == "":
+                continue
+            in_fence = line.startswith("```") and line.count("```") == 1
+            block.append(line)
+            continue
+        if in_fence:
+            if line.startswith("```"):
+                in_fence = False
+            block.append(line)
             continue
-        block = block.strip()
-        filtered_blocks.append(block)
-    return filtered_blocks
+        if line == "":
+            yield finish_block(block)
+            block = []
+            continue
+        block.append(line)
+    if block:
+        yield finish_block(block)
+
+
+def finish_block(lines):
+    while lines[-1].strip() == "":
+        lines.pop()
+    lines[-1] = lines[-1].rstrip()
+    return lines_to_block_type(lines), lines
 
 
 def block_to_block_type(block):
-    lines = block.split("\n")
+    return lines_to_block_type(block.split("\n"))
+
 
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
+def lines_to_block_type(lines):
+    first = lines[0]
+    if first.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
         return BlockType.HEADING
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
+    if len(lines) > 1 and first.startswith("```") and lines[-1].startswith("```"):
         return BlockType.CODE
-    if block.startswith(">"):
+    if first.startswith(">"):
         for line in lines:
             if not line.startswith(">"):
                 return BlockType.PARAGRAPH
         return BlockType.QUOTE
-    if block.startswith("- "):
+    if first.startswith("- "):
         for line in lines:
             if not line.startswith("- "):
                 return BlockType.PARAGRAPH
         return BlockType.ULIST
-    if block.startswith("1. "):
+    if first.startswith("1. "):
         i = 1
         for line in lines:
             if not line.startswith(f"{i}. "):
@@ -53,54 +85,43 @@ def block_to_block_type(block):
 
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    children = []
-    for block in blocks:
-        html_node = block_to_html_node(block)
-        children.append(html_node)
-    return ParentNode("div", children, None)
+    return lines_to_html_node(markdown.split("\n"))
+
+
+def lines_to_html_node(lines):
+    return ParentNode("div", list(iter_block_nodes(lines)), None)
+
+
+def iter_block_nodes(lines):
+    for block_type, block_lines in iter_blocks(lines):
+        yield typed_block_to_html_node(block_type, block_lines)
 
 
 def block_to_html_node(block):
-    block_type = block_to_block_type(block)
-    if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
-    if block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
-    if block_type == BlockType.CODE:
-        return code_to_html_node(block)
-    if block_type == BlockType.OLIST:
-        return olist_to_html_node(block)
-    if block_type == BlockType.ULIST:
-        return ulist_to_html_node(block)
-    if block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
-    raise ValueError("invalid block type")
+    lines = block.split("\n")
+    return typed_block_to_html_node(lines_to_block_type(lines), lines)
+
+
+def typed_block_to_html_node(block_type, lines):
+    handler = BLOCK_HANDLERS.get(block_type)
+    if handler is None:
+        raise ValueError("invalid block type")
+    return handler(lines)
 
 
 def text_to_children(text):
-    text_nodes = text_to_textnodes(text)
-    children = []
-    for text_node in text_nodes:
-        html_node = text_node_to_html_node(text_node)
-        children.append(html_node)
-    return children
+    return [text_node_to_html_node(node) for node in cached_text_to_textnodes(text)]
 
 
-def paragraph_to_html_node(block):
-    lines = block.split("\n")
+def paragraph_to_html_node(lines):
     paragraph = " ".join(lines)
     children = text_to_children(paragraph)
     return ParentNode("p", children)
 
 
-def heading_to_html_node(block):
-    level = 0
-    for char in block:
-        if char == "#":
-            level += 1
-        else:
-            break
+def heading_to_html_node(lines):
+    block = "\n".join(lines)
+    level = len(block) - len(block.lstrip("#"))
     if level + 1 >= len(block):
         raise ValueError(f"invalid heading level: {level}")
     text = block[level + 1 :]
@@ -108,38 +129,35 @@ def heading_to_html_node(block):
     return ParentNode(f"h{level}", children)
 
 
-def code_to_html_node(block):
-    if not block.startswith("```") or not block.endswith("```"):
+def code_to_html_node(lines):
+    if not lines[0].startswith("```") or not lines[-1].endswith("```"):
         raise ValueError("invalid code block")
-    text = block[4:-3]
+    text = "\n".join(lines[1:-1]) + "\n"
     raw_text_node = TextNode(text, TextType.TEXT)
     child = text_node_to_html_node(raw_text_node)
     code = ParentNode("code", [child])
     return ParentNode("pre", [code])
 
 
-def olist_to_html_node(block):
-    items = block.split("\n")
+def olist_to_html_node(lines):
     html_items = []
-    for item in items:
+    for item in lines:
         text = item[3:]
         children = text_to_children(text)
         html_items.append(ParentNode("li", children))
     return ParentNode("ol", html_items)
 
 
-def ulist_to_html_node(block):
-    items = block.split("\n")
+def ulist_to_html_node(lines):
     html_items = []
-    for item in items:
+    for item in lines:
         text = item[2:]
         children = text_to_children(text)
         html_items.append(ParentNode("li", children))
     return ParentNode("ul", html_items)
 
 
-def quote_to_html_node(block):
-    lines = block.split("\n")
+def quote_to_html_node(lines):
     new_lines = []
     for line in lines:
         if not line.startswith(">"):
@@ -148,3 +166,13 @@ def quote_to_html_node(block):
     content = " ".join(new_lines)
     children = text_to_children(content)
     return ParentNode("blockquote", children)
+
+
+BLOCK_HANDLERS = {
+    BlockType.PARAGRAPH: paragraph_to_html_node,
+    BlockType.HEADING: heading_to_html_node,
+    BlockType.CODE: code_to_html_node,
+    BlockType.OLIST: olist_to_html_node,
+    BlockType.ULIST: ulist_to_html_node,
+    BlockType.QUOTE: quote_to_html_node,
+}
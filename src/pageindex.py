@@ -0,0 +1,141 @@
+import json
+import os
+
+from frontmatter import find_heading, read_front_matter
+
+
+INDEX_VERSION = 1
+
+
+class PageEntry:
+    __slots__ = (
+        "from_path",
+        "dest_path",
+        "mtime_ns",
+        "size",
+        "title",
+        "date",
+        "tags",
+        "draft",
+    )
+
+    def __init__(self, from_path, dest_path, mtime_ns, size, title, date, tags, draft):
+        self.from_path = from_path
+        self.dest_path = dest_path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.title = title
+        self.date = date
+        self.tags = tags
+        self.draft = draft
+
+    def to_row(self):
+        return [
+            self.from_path,
+            self.dest_path,
+            self.mtime_ns,
+            self.size,
+            self.title,
+            self.date,
+            self.tags,
+            self.draft,
+        ]
+
+    def __repr__(self):
+        return f"PageEntry({self.from_path}, {self.title}, {self.date}, {self.tags})"
+
+
+class PageIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = None
+        self.reread = 0
+
+    def load(self):
+        self.entries = {}
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            return
+        for row in data["pages"]:
+            entry = PageEntry(*row)
+            self.entries[entry.from_path] = entry
+
+    def save(self):
+        if self.path is None or self.entries is None:
+            return
+        dir_path = os.path.dirname(self.path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "pages": [entry.to_row() for entry in self.entries.values()],
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, pages):
+        if self.entries is None:
+            self.load()
+        entries = {}
+        self.reread = 0
+        for from_path, dest_path in pages:
+            stat = os.stat(from_path)
+            entry = self.entries.get(from_path)
+            if (
+                entry is None
+                or entry.dest_path != dest_path
+                or entry.mtime_ns != stat.st_mtime_ns
+                or entry.size != stat.st_size
+            ):
+                entry = read_page_entry(from_path, dest_path, stat)
+                self.reread += 1
+            entries[from_path] = entry
+        self.entries = entries
+
+    def update(self, from_path, dest_path):
+        if self.entries is None:
+            self.load()
+        entry = read_page_entry(from_path, dest_path, os.stat(from_path))
+        self.entries[from_path] = entry
+        return entry
+
+    def remove(self, from_path):
+        if self.entries is None:
+            self.load()
+        self.entries.pop(from_path, None)
+
+    def get(self, from_path):
+        if self.entries is None:
+            self.load()
+        return self.entries.get(from_path)
+
+    def published(self):
+        if self.entries is None:
+            self.load()
+        return [entry for entry in self.entries.values() if not entry.draft]
+
+
+def read_page_entry(from_path, dest_path, stat):
+    with open(from_path, "r") as f:
+        try:
+            meta = read_front_matter(f)
+        except ValueError:
+            meta = {}
+        title = meta.get("title")
+        if title is None:
+            title = find_heading(f)
+    return PageEntry(
+        from_path,
+        dest_path,
+        stat.st_mtime_ns,
+        stat.st_size,
+        title,
+        meta.get("date"),
+        meta.get("tags", []),
+        meta.get("draft", False),
+    )
@@ -0,0 +1,167 @@
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+import inline_markdown
+import markdown_blocks
+
+
+active = None
+instrumented = False
+no_stage = nullcontext()
+
+
+class Profiler:
+    def __init__(self):
+        self.stages = {}
+        self.pages = {}
+        self.nested = []
+
+    @contextmanager
+    def stage(self, name):
+        start = self.start()
+        try:
+            yield
+        finally:
+            self.stop(name, start)
+
+    def start(self):
+        self.nested.append([0.0, 0])
+        return time.perf_counter(), sys.getallocatedblocks()
+
+    def stop(self, name, start, calls=1):
+        seconds = time.perf_counter() - start[0]
+        blocks = sys.getallocatedblocks() - start[1]
+        inner_seconds, inner_blocks = self.nested.pop()
+        if self.nested:
+            self.nested[-1][0] += seconds
+            self.nested[-1][1] += blocks
+        self.add(name, seconds - inner_seconds, blocks - inner_blocks, calls)
+
+    def iter_stage(self, name, iterator):
+        calls = 1
+        while True:
+            start = self.start()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.stop(name, start, calls)
+                calls = 0
+            yield item
+
+    def add(self, name, seconds, blocks, calls=1):
+        entry = self.stages.setdefault(name, [0, 0.0, 0])
+        entry[0] += calls
+        entry[1] += seconds
+        entry[2] += blocks
+
+    def add_page(self, from_path, seconds):
+        self.pages[from_path] = seconds
+
+    def merge(self, data):
+        for name, (calls, seconds, blocks) in data["stages"].items():
+            self.add(name, seconds, blocks, calls)
+        self.pages.update(data["pages"])
+
+    def to_dict(self):
+        return {"stages": self.stages, "pages": self.pages}
+
+    def report(self, top=10):
+        print("Stage                 calls     self s   mean ms  net live blocks")
+        stages = sorted(self.stages.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (calls, seconds, blocks) in stages:
+            mean_ms = seconds / calls * 1000 if calls else 0.0
+            print(f"{name:<20}{calls:>8}{seconds:>11.3f}{mean_ms:>10.3f}{blocks:>17}")
+        pages = sorted(self.pages.items(), key=lambda item: item[1], reverse=True)
+        print(f"Slowest pages ({min(top, len(pages))} of {len(pages)}):")
+        for from_path, seconds in pages[:top]:
+            print(f"{seconds * 1000:>10.3f} ms  {from_path}")
+
+    def save(self, path):
+        dir_path = os.path.dirname(path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        data = {
+            "stages": {
+                name: {"calls": calls, "seconds": seconds, "net_live_blocks": blocks}
+                for name, (calls, seconds, blocks) in self.stages.items()
+            },
+            "pages": self.pages,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+
+
+def is_profiling():
+    return active is not None
+
+
+def profile_stage(name):
+    if active is None:
+        return no_stage
+    return active.stage(name)
+
+
+def profile_iter(name, iterator):
+    if active is None:
+        return iterator
+    return active.iter_stage(name, iter(iterator))
+
+
+@contextmanager
+def profiling(profiler):
+    global active
+    if profiler is not None:
+        instrument_parser()
+    previous = active
+    active = profiler
+    try:
+        yield profiler
+    finally:
+        active = previous
+
+
+def instrument_parser():
+    global instrumented
+    if instrumented:
+        return
+    instrument_generator(markdown_blocks, "iter_blocks", "block split")
+    instrument(markdown_blocks, "lines_to_block_type", "block typing")
+    instrument(inline_markdown, "text_to_textnodes", "inline parsing")
+    instrumented = True
+
+
+def instrument(module, attr, name):
+    func = getattr(module, attr)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = active
+        if profiler is None:
+            return func(*args, **kwargs)
+        start = profiler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.stop(name, start)
+
+    setattr(module, attr, wrapper)
+
+
+def instrument_generator(module, attr, name):
+    func = getattr(module, attr)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = active
+        if profiler is None:
+            yield from func(*args, **kwargs)
+            return
+        yield from profiler.iter_stage(name, func(*args, **kwargs))
+
+    setattr(module, attr, wrapper)
@@ -0,0 +1,81 @@
+import re
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+ROOT_URL_PATTERN = re.compile(r'(href|src)="/([^"]*)"')
+PRESERVE_PATTERN = re.compile(
+    r"(<(pre|textarea|script|style)\b.*?</\2\s*>)", re.IGNORECASE | re.DOTALL
+)
+WHITESPACE_PATTERN = re.compile(r"[ \t\n\r\f]+")
+BLOCK_TAG_SPACE_PATTERN = re.compile(
+    r" ?(<(?:!doctype|/?(?:html|head|body|title|meta|link|base|article|main|header"
+    r"|footer|nav|section|aside|div|p|ul|ol|li|h[1-6]|blockquote|hr|br|table|tr"
+    r"|td|th|pre|script|style))\b[^>]*>) ?",
+    re.IGNORECASE,
+)
+
+
+class Template:
+    def __init__(self, text, basepath="/", path=None, minify=False, assets=None):
+        self.path = path
+        self.minify = minify
+        self.assets = {} if assets is None else assets
+        self.literals = []
+        self.names = []
+        self.references = []
+        text = rewrite_root_urls(text, basepath, self.assets, self.references)
+        self.saved = 0
+        if minify:
+            minified = minify_html(text)
+            self.saved = len(text.encode("utf-8")) - len(minified.encode("utf-8"))
+            text = minified
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.literals.append(text[position : match.start()])
+            self.names.append(match.group(1))
+            position = match.end()
+        self.literals.append(text[position:])
+
+    def render(self, variables):
+        return "".join(self.render_iter(variables))
+
+    def render_iter(self, variables):
+        yield self.literals[0]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = variables.get(name, "")
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+            yield literal
+
+    def __repr__(self):
+        return f"Template({self.path}, {self.names})"
+
+
+def load_template(template_path, basepath="/", minify=False, assets=None):
+    with open(template_path, "r") as f:
+        return Template(f.read(), basepath, template_path, minify, assets)
+
+
+def minify_html(html):
+    parts = PRESERVE_PATTERN.split(html)
+    minified = []
+    for i in range(0, len(parts), 3):
+        text = WHITESPACE_PATTERN.sub(" ", parts[i])
+        minified.append(BLOCK_TAG_SPACE_PATTERN.sub(r"\1", text))
+        if i + 1 < len(parts):
+            minified.append(parts[i + 1])
+    return "".join(minified).strip()
+
+
+def rewrite_root_urls(html, basepath, assets=None, references=None):
+    def rewrite(match):
+        url = "/" + match.group(2)
+        if assets:
+            url = assets.get(url, url)
+        if references is not None:
+            references.append(url)
+        return f'{match.group(1)}="{basepath}{url[1:]}"'
+
+    return ROOT_URL_PATTERN.sub(rewrite, html)
@@ -0,0 +1,54 @@
+import marshal
+import os
+import tempfile
+import time
+import unittest
+
+from astcache import ASTCache, decode_node, encode_node
+from markdown_blocks import markdown_to_html_node
+
+
+class TestASTCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ASTCache(self.tmp.name)
+        self.node = markdown_to_html_node(
+            "# Title\n\nSome **bold** and a [link](/a)\n\n- one\n- two"
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_encode_roundtrip(self):
+        data = encode_node(self.node)
+        self.assertEqual(decode_node(data).to_html(), self.node.to_html())
+        self.assertEqual(marshal.loads(marshal.dumps(data)), data)
+
+    def test_get_put(self):
+        self.assertIsNone(self.cache.get("abcd"))
+        self.cache.put("abcd", self.node)
+        self.assertEqual(self.cache.get("abcd").to_html(), self.node.to_html())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_version_mismatch_is_a_miss(self):
+        self.cache.put("abcd", self.node)
+        with open(self.cache.entry_path("abcd"), "wb") as f:
+            marshal.dump((-1, encode_node(self.node)), f)
+        self.assertIsNone(self.cache.get("abcd"))
+
+    def test_evict_least_recently_used(self):
+        for i, digest in enumerate(["aa01", "bb02", "cc03"]):
+            self.cache.put(digest, self.node)
+            past = time.time_ns() - (10 - i) * 1000000000
+            os.utime(self.cache.entry_path(digest), ns=(past, past))
+        self.cache.get("aa01")
+        size = os.path.getsize(self.cache.entry_path("aa01"))
+        self.cache.max_bytes = size * 2
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNotNone(self.cache.get("aa01"))
+        self.assertIsNone(self.cache.get("bb02"))
+        self.assertIsNotNone(self.cache.get("cc03"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from compress import Compressor, gzip_bytes
+from writer import ChangeSet
+
+
+class TestCompressor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.record = os.path.join(self.tmp.name, "compressed.json")
+        os.makedirs(self.dest)
+        self.page = self.write("index.html", "<p>hello</p>" * 200)
+        self.small = self.write("small.css", "p{}")
+        self.image = self.write("logo.png", "x" * 5000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.dest, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def compressor(self):
+        compressor = Compressor(self.record, formats={".gz": gzip_bytes})
+        compressor.load()
+        return compressor
+
+    def test_compresses_large_text_outputs(self):
+        compressor = self.compressor()
+        updated, total = compressor.compress_outputs(
+            [self.page, self.small, self.image]
+        )
+        self.assertEqual((updated, total), (1, 1))
+        with gzip.open(self.page + ".gz", "rb") as f:
+            self.assertEqual(f.read(), ("<p>hello</p>" * 200).encode())
+        self.assertFalse(os.path.exists(self.small + ".gz"))
+        self.assertFalse(os.path.exists(self.image + ".gz"))
+        self.assertEqual(compressor.outputs(), [self.page + ".gz"])
+
+    def test_unchanged_outputs_are_not_recompressed(self):
+        compressor = self.compressor()
+        compressor.compress_outputs([self.page])
+        compressor.save()
+        os.utime(self.page + ".gz", ns=(0, 0))
+
+        compressor = self.compressor()
+        self.assertEqual(compressor.compress_outputs([self.page]), (0, 1))
+        self.assertEqual(os.stat(self.page + ".gz").st_mtime_ns, 0)
+
+        self.write("index.html", "<p>changed</p>" * 200)
+        self.assertEqual(compressor.compress_outputs([self.page]), (0, 1))
+        changes = ChangeSet()
+        changes.wrote([self.page])
+        self.assertEqual(compressor.compress_outputs([self.page], changes), (1, 1))
+        with gzip.open(self.page + ".gz", "rb") as f:
+            self.assertEqual(f.read(), ("<p>changed</p>" * 200).encode())
+
+    def test_missing_variants_are_restored(self):
+        compressor = self.compressor()
+        compressor.compress_outputs([self.page])
+        os.remove(self.page + ".gz")
+        self.assertEqual(compressor.compress_outputs([self.page]), (1, 1))
+        self.assertTrue(os.path.exists(self.page + ".gz"))
+
+    def test_output_is_deterministic(self):
+        self.assertEqual(gzip_bytes(b"same" * 100), gzip_bytes(b"same" * 100))
+
+    def test_variants_of_removed_outputs_are_deleted(self):
+        compressor = self.compressor()
+        compressor.compress_outputs([self.page])
+        os.remove(self.page)
+        self.assertEqual(compressor.compress_outputs([]), (0, 0))
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+        self.assertEqual(compressor.outputs(), [])
+
+    def test_discard_removes_variants_of_rewritten_outputs(self):
+        compressor = self.compressor()
+        compressor.compress_outputs([self.page])
+        removed = compressor.discard([self.small, self.page])
+        self.assertEqual(removed, [self.page + ".gz"])
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+        self.assertEqual(compressor.outputs(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from copystatic import is_unchanged, sync_files_recursive
+from manifest import Manifest
+
+
+class TestSyncFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.manifest = Manifest(os.path.join(self.tmp.name, "manifest.json"))
+        self.write("index.css", "body {}")
+        self.write("images/a.png", "aaaa")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, text):
+        path = os.path.join(self.static, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def sync(self, **kwargs):
+        return sync_files_recursive(self.static, self.dest, self.manifest, **kwargs)
+
+    def test_copies_then_skips_unchanged(self):
+        changed, _ = self.sync()
+        self.assertEqual(len(changed), 2)
+        with open(os.path.join(self.dest, "images", "a.png")) as f:
+            self.assertEqual(f.read(), "aaaa")
+        changed, removed = self.sync()
+        self.assertEqual((changed, removed), ([], []))
+
+    def test_removes_orphans(self):
+        self.sync()
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        _, removed = self.sync()
+        self.assertEqual(removed, [os.path.join(self.dest, "images", "a.png")])
+        self.assertFalse(os.path.exists(removed[0]))
+
+    def test_fingerprint(self):
+        assets = {}
+        changed, _ = self.sync(assets=assets)
+        css = assets["/index.css"]
+        self.assertRegex(css, r"^/index\.[0-9a-f]{10}\.css$")
+        self.assertRegex(assets["/images/a.png"], r"^/images/a\.[0-9a-f]{10}\.png$")
+        self.assertTrue(os.path.exists(os.path.join(self.dest, css[1:])))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+
+        self.write("index.css", "body { color: red }")
+        changed, removed = self.sync(assets=assets)
+        self.assertNotEqual(assets["/index.css"], css)
+        self.assertEqual(len(changed), 1)
+        self.assertEqual(removed, [os.path.join(self.dest, css[1:])])
+
+    def test_fingerprint_digests_are_cached_by_stat(self):
+        self.sync(assets={})
+        css_path = os.path.join(self.static, "index.css")
+        cached = self.manifest.digests[css_path]
+        self.manifest.digests[css_path] = cached[:2] + ["0" * 64]
+        assets = {}
+        self.sync(assets=assets)
+        self.assertEqual(assets["/index.css"], "/index.0000000000.css")
+        os.utime(css_path, ns=(0, 0))
+        self.sync(assets=assets)
+        self.assertEqual(self.manifest.digests[css_path], [7, 0, cached[2]])
+        self.assertEqual(assets["/index.css"], f"/index.{cached[2][:10]}.css")
+
+    def test_hash_check(self):
+        self.sync()
+        from_path = os.path.join(self.static, "images", "a.png")
+        dest_path = os.path.join(self.dest, "images", "a.png")
+        os.utime(dest_path, ns=(0, 0))
+        self.assertTrue(is_unchanged(from_path, dest_path))
+        self.assertTrue(is_unchanged(from_path, dest_path, check_hash=True))
+        self.write("images/a.png", "bbbb")
+        self.assertFalse(is_unchanged(from_path, dest_path))
+        self.assertFalse(is_unchanged(from_path, dest_path, check_hash=True))
+
+    def test_link(self):
+        self.sync(link=True)
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.static, "index.css"),
+                os.path.join(self.dest, "index.css"),
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import random
+import tempfile
+import unittest
+
+from corpus import CorpusShape, generate_corpus, make_page, page_rel_path
+from gencontent import find_pages
+from markdown_blocks import markdown_to_html_node
+
+
+class TestCorpus(unittest.TestCase):
+    def test_page_rel_path(self):
+        shape = CorpusShape(depth=2, fanout=4)
+        self.assertEqual(page_rel_path(6, shape), "section-2/section-1/page-6")
+
+    def test_generate_corpus(self):
+        shape = CorpusShape(pages=12, depth=2, fanout=3, link_density=0.3)
+        with tempfile.TemporaryDirectory() as tmp:
+            total_bytes = generate_corpus(tmp, shape)
+            pages = find_pages(tmp, "docs")
+            sizes = [os.path.getsize(from_path) for from_path, _ in pages]
+        self.assertEqual(len(pages), 12)
+        self.assertEqual(sum(sizes), total_bytes)
+
+    def test_pages_parse(self):
+        shape = CorpusShape(pages=5, paragraphs=12, image_density=0.2)
+        rng = random.Random(1)
+        for index in range(shape.pages):
+            html = markdown_to_html_node(make_page(index, shape, rng)).to_html()
+            self.assertTrue(html.startswith(f"<div><h1>Page {index}</h1>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
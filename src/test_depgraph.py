@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+
+from depgraph import BuildInputs, page_dependencies, resolve_url, stale_reasons
+from gencontent import generate_pages_recursive
+from manifest import Manifest
+
+
+class TestResolveUrl(unittest.TestCase):
+    def test_resolve(self):
+        outputs = {
+            os.path.join("docs", "index.html"),
+            os.path.join("docs", "blog", "tom", "index.html"),
+            os.path.join("docs", "images", "tom.png"),
+        }
+        self.assertEqual(
+            resolve_url("/", "docs", outputs), os.path.join("docs", "index.html")
+        )
+        self.assertEqual(
+            resolve_url("/blog/tom#top", "docs", outputs),
+            os.path.join("docs", "blog", "tom", "index.html"),
+        )
+        self.assertEqual(
+            resolve_url("/images/tom.png", "docs", outputs),
+            os.path.join("docs", "images", "tom.png"),
+        )
+        self.assertIsNone(resolve_url("/blog/missing", "docs", outputs))
+
+
+class TestStaleReasons(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "index.md")
+        self.dest = os.path.join(self.tmp.name, "index.html")
+        for path in (self.source, self.dest):
+            with open(path, "w") as f:
+                f.write("# Hi")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def inputs(self, basepath="/", outputs=()):
+        return BuildInputs({"basepath": basepath}, self.tmp.name, outputs)
+
+    def entry(self, inputs, references=()):
+        keys = page_dependencies(self.source, self.source, references)
+        return {"dest": self.dest, "deps": inputs.snapshot(keys)}
+
+    def test_up_to_date(self):
+        entry = self.entry(self.inputs())
+        self.assertEqual(stale_reasons(entry, self.dest, self.inputs()), [])
+
+    def test_reasons(self):
+        self.assertEqual(stale_reasons(None, self.dest, self.inputs()), ["new page"])
+        entry = self.entry(self.inputs(), ["/about"])
+        about = os.path.join(self.tmp.name, "about.html")
+        self.assertEqual(
+            stale_reasons(entry, self.dest, self.inputs("/blog/", [about])),
+            ["basepath changed from '/' to '/blog/'", "link target /about appeared"],
+        )
+        with open(self.source, "w") as f:
+            f.write("# Changed")
+        self.assertEqual(
+            stale_reasons(entry, self.dest, self.inputs()), [f"{self.source} changed"]
+        )
+        os.remove(self.dest)
+        self.assertEqual(
+            stale_reasons(entry, self.dest, self.inputs()), ["output missing"]
+        )
+
+
+class TestIncrementalRebuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        self.write(self.template, "{{ Title }}{{ Content }}")
+        self.write_page("index.md", "# Home\n\n[about](/about)")
+        self.write_page("contact.md", "# Contact")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def write_page(self, rel_path, markdown):
+        self.write(os.path.join(self.content, rel_path), markdown)
+
+    def build(self):
+        manifest = Manifest(self.manifest_path)
+        manifest.load()
+        generate_pages_recursive(
+            self.content, self.template, self.dest, "/", manifest=manifest
+        )
+        manifest.save()
+
+    def mtimes(self):
+        return {
+            name: os.stat(os.path.join(self.dest, name)).st_mtime_ns
+            for name in os.listdir(self.dest)
+            if name.endswith(".html")
+        }
+
+    def test_only_affected_pages_rebuild(self):
+        self.build()
+        for name in os.listdir(self.dest):
+            os.utime(os.path.join(self.dest, name), ns=(0, 0))
+        self.write_page("contact.md", "# Contact us")
+        self.build()
+        self.assertEqual(self.mtimes()["index.html"], 0)
+        self.assertNotEqual(self.mtimes()["contact.html"], 0)
+
+        os.utime(os.path.join(self.dest, "contact.html"), ns=(0, 0))
+        self.write_page("about.md", "# About")
+        self.build()
+        mtimes = self.mtimes()
+        self.assertEqual(mtimes["contact.html"], 0)
+        self.assertIn("about.html", mtimes)
+
+        manifest = Manifest(self.manifest_path)
+        manifest.load()
+        index = os.path.join(self.content, "index.md")
+        self.assertTrue(manifest.pages[index]["deps"]["url:/about"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from discovery import PAGE, STATIC, discover_tasks, scan_trees, tasks_of_kind
+
+
+class TestDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        for rel_path in (
+            "content/index.md",
+            "content/blog/b/index.md",
+            "content/blog/a/index.md",
+            "content/about.md",
+            "static/index.css",
+            "static/images/logo.png",
+        ):
+            path = os.path.join(self.tmp.name, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("x")
+        os.makedirs(os.path.join(self.content, "empty"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_trees_sorted_depth_first(self):
+        for threads in (1, 4):
+            content, static = scan_trees([self.content, self.static], threads)
+            self.assertEqual(
+                content,
+                [
+                    "about.md",
+                    os.path.join("blog", "a", "index.md"),
+                    os.path.join("blog", "b", "index.md"),
+                    "index.md",
+                ],
+            )
+            self.assertEqual(static, [os.path.join("images", "logo.png"), "index.css"])
+
+    def test_discover_tasks(self):
+        tasks = discover_tasks(self.content, self.static, self.dest)
+        self.assertEqual([kind for kind, _, _ in tasks], [STATIC] * 2 + [PAGE] * 4)
+        self.assertEqual(
+            tasks_of_kind(tasks, PAGE)[0],
+            (
+                os.path.join(self.content, "about.md"),
+                os.path.join(self.dest, "about.html"),
+            ),
+        )
+        self.assertEqual(
+            tasks_of_kind(tasks, STATIC)[1],
+            (
+                os.path.join(self.static, "index.css"),
+                os.path.join(self.dest, "index.css"),
+            ),
+        )
+
+    def test_missing_directory(self):
+        with self.assertRaises(FileNotFoundError):
+            scan_trees([os.path.join(self.tmp.name, "missing")])
+
+
+if __name__ == "__main__":
+    unittest.main()
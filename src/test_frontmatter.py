@@ -0,0 +1,58 @@
+import io
+import unittest
+
+from frontmatter import read_front_matter, split_front_matter
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_split(self):
+        meta, body = split_front_matter(
+            "---\n"
+            'title: "Tom: a review"\n'
+            "date: 2024-02-15\n"
+            "tags: [characters, opinion]\n"
+            "draft: true\n"
+            "---\n"
+            "\n"
+            "# Tom\n"
+        )
+        self.assertEqual(
+            meta,
+            {
+                "title": "Tom: a review",
+                "date": "2024-02-15",
+                "tags": ["characters", "opinion"],
+                "draft": True,
+            },
+        )
+        self.assertEqual(body, "\n# Tom\n")
+
+    def test_list_items(self):
+        meta, _ = split_front_matter("---\ntags:\n  - a\n  - 'b c'\n---\n")
+        self.assertEqual(meta, {"tags": ["a", "b c"]})
+
+    def test_no_front_matter(self):
+        markdown = "# Title\n\n---\n"
+        self.assertEqual(split_front_matter(markdown), ({}, markdown))
+
+    def test_unclosed_header_is_body_text(self):
+        markdown = "---\ntitle: never closed\n# Title\n"
+        self.assertEqual(split_front_matter(markdown), ({}, markdown))
+        f = io.StringIO(markdown)
+        self.assertEqual(read_front_matter(f), {})
+        self.assertEqual(f.read(), markdown)
+
+    def test_reads_only_the_header(self):
+        f = io.StringIO("---\ntitle: Hi\n---\n# Body\n")
+        self.assertEqual(read_front_matter(f), {"title": "Hi"})
+        self.assertEqual(f.read(), "# Body\n")
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ndate: yesterday\n---\n")
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ndraft: maybe\n---\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,18 @@
+import os
+import tempfile
+import tracemalloc
 import unittest
 
-from gencontent import extract_title
+from gencontent import (
+    extract_title,
+    generate_page,
+    generate_page_streaming,
+    generate_pages_recursive,
+    remove_orphans,
+)
+from inline_markdown import configure_inline_cache, default_inline_cache_bytes
+from template import Template
+from writer import ChangeSet
 
 
 class TestExtractTitle(unittest.TestCase):
@@ -46,5 +58,149 @@ no title
             pass
 
 
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        for name in ["a", "b", "c"]:
+            self.write_page(os.path.join(name, "index.md"), f"# Page {name}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_page(self, rel_path, markdown):
+        path = os.path.join(self.content, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(markdown)
+
+    def read_output(self, rel_path):
+        with open(os.path.join(self.dest, rel_path)) as f:
+            return f.read()
+
+    def test_parallel(self):
+        generate_pages_recursive(self.content, self.template, self.dest, "/", jobs=2)
+        self.assertEqual(
+            self.read_output("b/index.html"),
+            "<title>Page b</title><main><div><h1>Page b</h1></div></main>",
+        )
+
+    def test_errors_reported_per_file(self):
+        self.write_page("broken.md", "no title here")
+        with self.assertRaises(RuntimeError):
+            generate_pages_recursive(
+                self.content, self.template, self.dest, "/", jobs=2
+            )
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "c", "index.html")))
+
+    def test_failed_pages_are_left_out_of_listings(self):
+        good = "---\ndate: 2024-05-02\n---\n# Good"
+        self.write_page(os.path.join("blog", "good.md"), good)
+        broken = "---\ndate: 2024-05-01\n---\nno heading here"
+        self.write_page(os.path.join("blog", "broken.md"), broken)
+        with self.assertRaises(RuntimeError):
+            generate_pages_recursive(self.content, self.template, self.dest, "/")
+        listing = self.read_output(os.path.join("blog", "index.html"))
+        self.assertIn('href="/blog/good.html"', listing)
+        self.assertNotIn("broken", listing)
+
+    def test_unchanged_pages_are_not_rewritten(self):
+        generate_pages_recursive(self.content, self.template, self.dest, "/")
+        path = os.path.join(self.dest, "a", "index.html")
+        os.utime(path, ns=(0, 0))
+        generate_pages_recursive(self.content, self.template, self.dest, "/")
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+        self.write_page(os.path.join("a", "index.md"), "# Page A")
+        generate_pages_recursive(self.content, self.template, self.dest, "/")
+        self.assertNotEqual(os.stat(path).st_mtime_ns, 0)
+
+    def test_changes_are_collected_from_the_writers(self):
+        for jobs in (1, 2):
+            changes = ChangeSet()
+            generate_pages_recursive(
+                self.content, self.template, self.dest, "/", jobs=jobs, changes=changes
+            )
+            self.assertEqual(len(changes.result()[0]), 3 if jobs == 1 else 0)
+        self.write_page(os.path.join("b", "index.md"), "# Page B")
+        changes = ChangeSet()
+        generate_pages_recursive(
+            self.content, self.template, self.dest, "/", jobs=2, changes=changes
+        )
+        path = os.path.normpath(os.path.join(self.dest, "b", "index.html"))
+        self.assertEqual(changes.result(), ([path], []))
+
+    def test_remove_orphans(self):
+        generate_pages_recursive(self.content, self.template, self.dest, "/")
+        live_paths = [
+            os.path.join(self.dest, name, "index.html") for name in ["a", "c"]
+        ]
+        removed = remove_orphans(self.dest, live_paths)
+        self.assertEqual(removed, [os.path.join(self.dest, "b", "index.html")])
+        self.assertEqual(sorted(os.listdir(self.dest)), ["a", "c"])
+
+
+class TestStreamingPage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.template = Template("<title>{{ Title }}</title>{{ Content }}", "/site/")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_markdown(self, name, sections):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write("# Reference\n\n")
+            for i in range(sections):
+                f.write(f"## Function {i}\n\nCalls [the next one](/ref/{i + 1}) ")
+                f.write("with **bold** and `code`.\n\n- item one\n- item two\n\n")
+                f.write("```\nresult = call()\n\nreturn result\n```\n\n")
+        return path
+
+    def peak_streaming_memory(self, from_path):
+        dest_path = os.path.join(self.tmp.name, "out.html")
+        configure_inline_cache(0)
+        tracemalloc.start()
+        try:
+            generate_page_streaming(from_path, self.template, dest_path, "/site/")
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            configure_inline_cache(default_inline_cache_bytes)
+
+    def test_matches_in_memory_render(self):
+        from_path = self.write_markdown("small.md", 20)
+        streamed_path = os.path.join(self.tmp.name, "streamed.html")
+        loaded_path = os.path.join(self.tmp.name, "loaded.html")
+        generate_page_streaming(from_path, self.template, streamed_path, "/site/")
+        generate_page(from_path, self.template, loaded_path, "/site/")
+        with open(streamed_path) as streamed, open(loaded_path) as loaded:
+            self.assertEqual(streamed.read(), loaded.read())
+
+    def test_front_matter_fills_template_variables(self):
+        from_path = os.path.join(self.tmp.name, "post.md")
+        with open(from_path, "w") as f:
+            f.write("---\nauthor: Bilbo\ndate: 2024-02-15\ntags: [a, b]\n---\n# Post\n")
+        template = Template("{{ Title }} by {{ Author }} on {{ Date }} ({{ Tags }})")
+        for generate in (generate_page, generate_page_streaming):
+            dest_path = os.path.join(self.tmp.name, f"{generate.__name__}.html")
+            generate(from_path, template, dest_path, "/")
+            with open(dest_path) as f:
+                self.assertEqual(f.read(), "Post by Bilbo on 2024-02-15 (a, b)")
+
+    def test_memory_does_not_grow_with_document_size(self):
+        small_path = self.write_markdown("small.md", 500)
+        large_path = self.write_markdown("large.md", 2000)
+        small_peak = self.peak_streaming_memory(small_path)
+        large_peak = self.peak_streaming_memory(large_path)
+        self.assertGreater(os.path.getsize(large_path), 256 * 1024)
+        self.assertLess(large_peak, 256 * 1024)
+        self.assertLess(large_peak, small_peak * 1.5)
+
+
 if __name__ == "__main__":
     unittest.main()
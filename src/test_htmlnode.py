@@ -1,5 +1,6 @@
+import io
 import unittest
-from htmlnode import LeafNode, ParentNode, HTMLNode
+from htmlnode import LeafNode, ParentNode, HTMLNode, minify_stats
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -49,6 +50,11 @@ class TestHTMLNode(unittest.TestCase):
             "HTMLNode(p, What a strange world, children: None, {'class': 'primary'})",
         )
 
+    def test_slots(self):
+        for node in [LeafNode("p", "text"), ParentNode("div", [])]:
+            self.assertFalse(hasattr(node, "__dict__"))
+            self.assertIsNone(node.props)
+
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
         self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
@@ -60,3 +66,55 @@ class TestHTMLNode(unittest.TestCase):
             '<a href="https://www.google.com">Click me!</a>',
         )
 
+    def test_to_html_with_grandchildren(self):
+        grandchild_node = LeafNode("b", "grandchild")
+        child_node = ParentNode("span", [grandchild_node])
+        parent_node = ParentNode("div", [child_node])
+        self.assertEqual(
+            parent_node.to_html(),
+            "<div><span><b>grandchild</b></span></div>",
+        )
+
+    def test_to_html_iter_chunks(self):
+        node = ParentNode(
+            "p",
+            [LeafNode("b", "Bold"), LeafNode(None, " text")],
+            {"class": "intro"},
+        )
+        self.assertEqual(
+            list(node.to_html_iter()),
+            ['<p class="intro">', "<b>Bold</b>", " text", "</p>"],
+        )
+
+    def test_write_html(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "item")])])
+        out = io.StringIO()
+        node.write_html(out)
+        self.assertEqual(out.getvalue(), "<ul><li>item</li></ul>")
+
+    def test_minify_collapses_text_but_not_code(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode(
+                    "p", [LeafNode(None, "one\n  two"), LeafNode("code", "a  b")]
+                ),
+                ParentNode("pre", [ParentNode("code", [LeafNode(None, "x\n  y")])]),
+            ],
+        )
+        saved = minify_stats.bytes_saved
+        self.assertEqual(
+            node.to_html(minify=True),
+            "<div><p>one two<code>a  b</code></p><pre><code>x\n  y</code></pre></div>",
+        )
+        self.assertEqual(minify_stats.bytes_saved - saved, 2)
+        self.assertIn("one\n  two", node.to_html())
+
+    def test_parent_without_children(self):
+        node = ParentNode("div", None)
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+
+if __name__ == "__main__":
+    unittest.main()
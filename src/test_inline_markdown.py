@@ -1,5 +1,6 @@
 import unittest
 from inline_markdown import (
+    InlineCache,
     split_nodes_delimiter,
     split_nodes_image,
     split_nodes_link,
@@ -191,6 +192,67 @@ class TestInlineMarkdown(unittest.TestCase):
             nodes,
         )
 
+    def test_text_to_textnodes_links_and_images_only(self):
+        nodes = text_to_textnodes("![a](/a.png)[b](/b)[c](/c) tail")
+        self.assertListEqual(
+            [
+                TextNode("a", TextType.IMAGE, "/a.png"),
+                TextNode("b", TextType.LINK, "/b"),
+                TextNode("c", TextType.LINK, "/c"),
+                TextNode(" tail", TextType.TEXT),
+            ],
+            nodes,
+        )
+
+    def test_text_to_textnodes_delimiters_inside_spans(self):
+        nodes = text_to_textnodes(
+            "see [snake_case](https://example.com/a_b) and `x ** y`"
+        )
+        self.assertListEqual(
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("snake_case", TextType.LINK, "https://example.com/a_b"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("x ** y", TextType.CODE),
+            ],
+            nodes,
+        )
+
+    def test_text_to_textnodes_unclosed(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This is **not closed")
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This is _not closed")
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = InlineCache()
+        first = cache.text_to_textnodes("a [link](/x) here")
+        second = cache.text_to_textnodes("a [link](/x) here")
+        self.assertIs(first, second)
+        self.assertListEqual(list(first), text_to_textnodes("a [link](/x) here"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = InlineCache()
+        cache.text_to_textnodes("one")
+        cache.max_bytes = cache.size * 2
+        cache.text_to_textnodes("two")
+        cache.text_to_textnodes("one")
+        cache.text_to_textnodes("six")
+        self.assertEqual(list(cache.entries), ["one", "six"])
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_errors_are_not_cached(self):
+        cache = InlineCache()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.text_to_textnodes("**open")
+        self.assertEqual(cache.stats()["entries"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
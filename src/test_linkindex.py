@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+
+from linkindex import LinkIndex, output_url, resolve_link
+
+
+class TestLinkIndex(unittest.TestCase):
+    def setUp(self):
+        self.dest = "docs"
+        self.outputs = [
+            os.path.join("docs", "index.html"),
+            os.path.join("docs", "blog", "tom", "index.html"),
+            os.path.join("docs", "images", "tom.png"),
+        ]
+        self.index = LinkIndex(self.dest)
+        self.index.add(
+            "content/index.md",
+            os.path.join("docs", "index.html"),
+            ["/blog/tom", "/images/tom.png", "https://boot.dev", "/missing"],
+        )
+        self.index.add(
+            "content/blog/tom/index.md",
+            os.path.join("docs", "blog", "tom", "index.html"),
+            ["../../", "#top", "../majesty"],
+        )
+
+    def test_output_url(self):
+        self.assertEqual(output_url(self.outputs[0], self.dest), "/")
+        self.assertEqual(output_url(self.outputs[1], self.dest), "/blog/tom/")
+        self.assertEqual(output_url(self.outputs[2], self.dest), "/images/tom.png")
+
+    def test_resolve_link(self):
+        self.assertEqual(resolve_link("/blog/tom/", "../majesty"), "/blog/majesty")
+        self.assertEqual(resolve_link("/", "/contact#form"), "/contact")
+        self.assertIsNone(resolve_link("/", "https://boot.dev"))
+        self.assertIsNone(resolve_link("/", "mailto:tom@example.com"))
+        self.assertIsNone(resolve_link("/", "#top"))
+
+    def test_validate(self):
+        self.assertEqual(self.index.link_count(), 7)
+        self.assertEqual(
+            self.index.validate(self.outputs),
+            [
+                ("content/index.md", "/missing"),
+                ("content/blog/tom/index.md", "../majesty"),
+            ],
+        )
+
+    def test_save_link_graph(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "links.json")
+            self.index.save(path, self.outputs)
+            with open(path) as f:
+                pages = json.load(f)["pages"]
+        self.assertEqual(
+            pages["/"],
+            {
+                "source": "content/index.md",
+                "links": ["/blog/tom/", "/images/tom.png"],
+                "external": ["https://boot.dev"],
+                "broken": ["/missing"],
+            },
+        )
+        self.assertEqual(pages["/blog/tom/"]["links"], ["/"])
+
+
+if __name__ == "__main__":
+    unittest.main()
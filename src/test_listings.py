@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+
+from gencontent import generate_listings
+from listings import plan_listings, slugify, tag_slugs
+from manifest import Manifest
+from pageindex import PageEntry
+from template import Template
+
+
+def make_entry(name, date, tags):
+    dest_path = os.path.join("docs", "blog", name, "index.html")
+    return PageEntry(f"{name}.md", dest_path, 0, 0, name.title(), date, tags, False)
+
+
+class TestPlanListings(unittest.TestCase):
+    def setUp(self):
+        self.entries = [
+            make_entry("b", "2024-01-02", ["x"]),
+            make_entry("a", "2024-01-02", ["x", "Big Tag"]),
+            make_entry("c", "2024-03-01", []),
+            make_entry("d", "2023-12-31", ["x"]),
+            make_entry("e", "2024-02-01", []),
+            make_entry("home", None, []),
+        ]
+
+    def by_url(self, listings):
+        return {listing.url: listing for listing in listings}
+
+    def test_sections_are_sorted_and_paginated(self):
+        listings = self.by_url(plan_listings(self.entries, "docs", page_size=2))
+        self.assertEqual(
+            sorted(listings),
+            [
+                "/blog/",
+                "/blog/page/2/",
+                "/blog/page/3/",
+                "/tags/",
+                "/tags/big-tag/",
+                "/tags/x/",
+                "/tags/x/page/2/",
+            ],
+        )
+        first = listings["/blog/"]
+        self.assertEqual([post[0] for post in first.posts], ["C", "E"])
+        self.assertEqual((first.newer, first.older), (None, "/blog/page/2/"))
+        second = listings["/blog/page/2/"]
+        self.assertEqual([post[0] for post in second.posts], ["A", "B"])
+        self.assertEqual(second.title, "Blog (page 2)")
+        self.assertEqual(
+            second.dest_path, os.path.join("docs", "blog", "page", "2", "index.html")
+        )
+        self.assertEqual([post[0] for post in listings["/tags/x/"].posts], ["A", "B"])
+        self.assertEqual(
+            listings["/tags/"].tags,
+            [("Big Tag", "/tags/big-tag/", 1), ("x", "/tags/x/", 3)],
+        )
+
+    def test_hand_written_section_index_wins(self):
+        taken = [os.path.join("docs", "blog", "index.html")]
+        listings = self.by_url(plan_listings(self.entries, "docs", 2, taken))
+        self.assertNotIn("/blog/", listings)
+        self.assertNotIn("/blog/page/2/", listings)
+
+    def test_slugify(self):
+        self.assertEqual(slugify("C++ & Python!"), "c-python")
+
+    def test_colliding_tag_slugs_are_disambiguated(self):
+        self.assertEqual(
+            tag_slugs(["C++", "c", "C", "c-2"]),
+            {"C": "c", "C++": "c-2", "c": "c-3", "c-2": "c-2-2"},
+        )
+        with self.assertRaises(ValueError):
+            tag_slugs(["ok", "+++"])
+
+
+class TestGenerateListings(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.manifest = Manifest(os.path.join(self.tmp.name, "manifest.json"))
+        self.template = Template("{{ Title }}|{{ Content }}")
+        self.entries = [
+            PageEntry(
+                f"{i}.md",
+                os.path.join(self.dest, "blog", str(i), "index.html"),
+                0,
+                0,
+                f"Post {i}",
+                f"2024-01-{i + 10}",
+                ["odd" if i % 2 else "even"],
+                False,
+            )
+            for i in range(6)
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self):
+        listings = plan_listings(self.entries, self.dest, page_size=2)
+        generate_listings(listings, self.template, "/", self.manifest, self.dest)
+        return listings
+
+    def test_only_affected_pages_regenerate(self):
+        listings = self.generate()
+        for listing in listings:
+            os.utime(listing.dest_path, ns=(0, 0))
+        self.entries[0].title = "Renamed"
+        self.generate()
+        changed = [
+            os.path.relpath(listing.dest_path, self.dest)
+            for listing in listings
+            if os.stat(listing.dest_path).st_mtime_ns != 0
+        ]
+        self.assertEqual(
+            changed,
+            [
+                os.path.join("blog", "page", "3", "index.html"),
+                os.path.join("tags", "even", "page", "2", "index.html"),
+            ],
+        )
+        with open(os.path.join(self.dest, "blog", "page", "3", "index.html")) as f:
+            self.assertIn('<a href="/blog/0/">Renamed</a>', f.read())
+
+    def test_removed_listings_are_deleted(self):
+        self.generate()
+        self.entries = self.entries[:2]
+        self.generate()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "page")))
+        self.assertEqual(len(self.manifest.generated), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
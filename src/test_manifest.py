@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+
+from manifest import Manifest, hash_bytes, hash_file
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "manifest.json")
+        self.dest = os.path.join(self.tmp.name, "index.html")
+        with open(self.dest, "w") as f:
+            f.write("<p>hi</p>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hash_file(self):
+        self.assertEqual(hash_file(self.dest), hash_bytes(b"<p>hi</p>"))
+
+    def test_round_trip(self):
+        manifest = Manifest(self.path)
+        manifest.record("index.md", self.dest, {"file:index.md": "abc"})
+        manifest.static = ["index.css"]
+        manifest.save()
+
+        reloaded = Manifest(self.path)
+        reloaded.load()
+        self.assertEqual(reloaded.pages, manifest.pages)
+        self.assertEqual(reloaded.outputs(), [self.dest, "index.css"])
+
+    def test_prune(self):
+        manifest = Manifest(self.path)
+        manifest.record("a.md", "a.html", {})
+        manifest.record("b.md", "b.html", {})
+        self.assertEqual(manifest.prune({"a.md"}), ["b.html"])
+        self.assertEqual(list(manifest.pages), ["a.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
+import io
 import unittest
 from markdown_blocks import (
     markdown_to_html_node,
     markdown_to_blocks,
     block_to_block_type,
+    iter_blocks,
     BlockType,
 )
 
@@ -60,3 +62,51 @@ This is the same paragraph on a new line
         self.assertEqual(block_to_block_type(block), BlockType.QUOTE)
         block = "- list\n- items"
         self.assertEqual(block_to_block_type(block), BlockType.ULIST)
+
+    def test_iter_blocks_from_file(self):
+        md = io.StringIO("# Title\n\n  - one\n- two  \n\n\n1. first\n2. second\n")
+        self.assertEqual(
+            list(iter_blocks(md)),
+            [
+                (BlockType.HEADING, ["# Title"]),
+                (BlockType.ULIST, ["- one", "- two"]),
+                (BlockType.OLIST, ["1. first", "2. second"]),
+            ],
+        )
+
+    def test_code_block_with_blank_lines(self):
+        md = """
+```
+def main():
+
+    return 1
+```
+
+after
+"""
+        node = markdown_to_html_node(md)
+        self.assertEqual(
+            node.to_html(),
+            "<div><pre><code>def main():\n\n    return 1\n</code></pre><p>after</p></div>",
+        )
+
+    def test_code_block_language(self):
+        node = markdown_to_html_node("```python\nx = 1\n```")
+        self.assertEqual(node.to_html(), "<div><pre><code>x = 1\n</code></pre></div>")
+
+    def test_paragraphs(self):
+        md = """
+This is **bolded** paragraph
+text in a p
+tag here
+
+"""
+        node = markdown_to_html_node(md)
+        self.assertEqual(
+            node.to_html(),
+            "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p></div>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
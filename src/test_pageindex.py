@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+from gencontent import generate_pages_recursive
+from pageindex import PageIndex
+
+
+class TestPageIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.path = os.path.join(self.tmp.name, "cache", "pages.json")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write("{{ Title }}|{{ Content }}")
+        self.write("post.md", "---\ndate: 2024-01-02\ntags: [a]\n---\n# Post\n")
+        self.write("draft.md", "---\ntitle: Draft\ndraft: yes\n---\nbody _never")
+        self.pages = [
+            (os.path.join(self.content, name), os.path.join(self.dest, name))
+            for name in ("draft.md", "post.md")
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        os.makedirs(self.content, exist_ok=True)
+        with open(os.path.join(self.content, name), "w") as f:
+            f.write(text)
+
+    def test_refresh_reads_headers(self):
+        index = PageIndex(self.path)
+        index.refresh(self.pages)
+        post = index.get(self.pages[1][0])
+        self.assertEqual(
+            (post.title, post.date, post.tags, post.draft),
+            ("Post", "2024-01-02", ["a"], False),
+        )
+        self.assertTrue(index.get(self.pages[0][0]).draft)
+        self.assertEqual([entry.title for entry in index.published()], ["Post"])
+
+    def test_reloads_lazily_and_rereads_changed_files(self):
+        index = PageIndex(self.path)
+        index.refresh(self.pages)
+        self.assertEqual(index.reread, 2)
+        index.save()
+
+        reloaded = PageIndex(self.path)
+        self.assertIsNone(reloaded.entries)
+        self.assertEqual(reloaded.get(self.pages[1][0]).title, "Post")
+        reloaded.refresh(self.pages)
+        self.assertEqual(reloaded.reread, 0)
+        self.write("post.md", "---\ntitle: Renamed post\n---\n# Post\n")
+        reloaded.refresh(self.pages)
+        self.assertEqual(reloaded.reread, 1)
+        self.assertEqual(reloaded.get(self.pages[1][0]).title, "Renamed post")
+
+    def test_update_and_remove_single_entries(self):
+        index = PageIndex()
+        index.refresh(self.pages)
+        self.write("post.md", "---\ntitle: Edited\n---\n")
+        self.assertEqual(index.update(*self.pages[1]).title, "Edited")
+        self.assertEqual(index.get(self.pages[1][0]).title, "Edited")
+        index.remove(self.pages[0][0])
+        self.assertIsNone(index.get(self.pages[0][0]))
+        self.assertEqual([entry.title for entry in index.published()], ["Edited"])
+
+    def test_drafts_are_not_rendered(self):
+        generate_pages_recursive(
+            self.content, self.template, self.dest, "/", page_size=0
+        )
+        self.assertEqual(os.listdir(self.dest), ["post.html"])
+        with open(os.path.join(self.dest, "post.html")) as f:
+            self.assertEqual(f.read(), "Post|<div><h1>Post</h1></div>")
+
+    def test_unclosed_header_renders_as_body(self):
+        os.remove(os.path.join(self.content, "draft.md"))
+        self.write("post.md", "---\n\n# Post\n")
+        generate_pages_recursive(
+            self.content, self.template, self.dest, "/", page_size=0
+        )
+        index = PageIndex(self.path)
+        index.refresh(self.pages[1:])
+        self.assertEqual(index.get(self.pages[1][0]).title, "Post")
+        with open(os.path.join(self.dest, "post.html")) as f:
+            self.assertEqual(f.read(), "Post|<div><p>---</p><h1>Post</h1></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from inline_markdown import configure_inline_cache, default_inline_cache_bytes
+from markdown_blocks import markdown_to_html_node
+from profiler import Profiler, is_profiling, profile_iter, profile_stage, profiling
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        configure_inline_cache(0)
+
+    def tearDown(self):
+        configure_inline_cache(default_inline_cache_bytes)
+
+    def test_stage(self):
+        profiler = Profiler()
+        with profiling(profiler):
+            self.assertTrue(is_profiling())
+            with profile_stage("read"):
+                pass
+            with profile_stage("read"):
+                pass
+        self.assertFalse(is_profiling())
+        self.assertEqual(profiler.stages["read"][0], 2)
+
+    def test_instrumented_parser(self):
+        profiler = Profiler()
+        with profiling(profiler):
+            markdown_to_html_node("# Title\n\nSome **text**\n\n- a\n- b")
+        self.assertEqual(profiler.stages["block split"][0], 1)
+        self.assertEqual(profiler.stages["block typing"][0], 3)
+        self.assertEqual(profiler.stages["inline parsing"][0], 4)
+
+    def test_nested_stages_record_self_time(self):
+        profiler = Profiler()
+        with profiling(profiler):
+            with profile_stage("write"):
+                chunks = profile_iter("to_html", iter(["a", "b"]))
+                for _ in chunks:
+                    time.sleep(0.01)
+                    with profile_stage("inner"):
+                        time.sleep(0.01)
+        self.assertEqual(profiler.stages["to_html"][0], 1)
+        self.assertEqual(profiler.stages["inner"][0], 2)
+        self.assertGreater(profiler.stages["write"][1], 0.015)
+        self.assertLess(profiler.stages["write"][1], 0.035)
+
+    def test_inactive_profiler_records_nothing(self):
+        profiler = Profiler()
+        with profiling(profiler):
+            pass
+        markdown_to_html_node("# Title")
+        self.assertEqual(profiler.stages, {})
+
+    def test_merge_and_save(self):
+        profiler = Profiler()
+        profiler.add("write", 0.5, 10)
+        other = Profiler()
+        other.add("write", 0.25, 5)
+        other.add_page("index.md", 0.75)
+        profiler.merge(other.to_dict())
+        self.assertEqual(profiler.stages["write"], [2, 0.75, 15])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            profiler.save(path)
+            with open(path) as f:
+                data = json.load(f)
+        self.assertEqual(data["stages"]["write"]["calls"], 2)
+        self.assertEqual(data["pages"], {"index.md": 0.75})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+from gencontent import apply_basepath
+from htmlnode import LeafNode, ParentNode
+from template import Template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(template.names, ["Title", "Content"])
+        self.assertEqual(
+            template.render({"Title": "Hi", "Content": "<p>body</p>"}),
+            "<title>Hi</title><main><p>body</p></main>",
+        )
+
+    def test_render_metadata_variables(self):
+        template = Template("{{Title}} by {{ Author }} on {{ Date }}")
+        self.assertEqual(
+            template.render({"Title": "Post", "Author": "Bilbo"}),
+            "Post by Bilbo on ",
+        )
+
+    def test_render_iter_streams_chunks(self):
+        template = Template("<main>{{ Content }}</main>")
+        chunks = template.render_iter({"Content": iter(["<p>", "a", "</p>"])})
+        self.assertEqual(list(chunks), ["<main>", "<p>", "a", "</p>", "</main>"])
+
+    def test_render_repeated_variable(self):
+        template = Template("{{ Title }}|{{ Title }}")
+        self.assertEqual(template.render({"Title": "x"}), "x|x")
+
+    def test_basepath_rewrites_template_once(self):
+        template = Template(
+            '<link href="/index.css" /><script src="/app.js"></script>{{ Content }}',
+            "/blog/",
+        )
+        self.assertEqual(
+            template.render({"Content": '<code>href="/raw"</code>'}),
+            '<link href="/blog/index.css" /><script src="/blog/app.js"></script>'
+            '<code>href="/raw"</code>',
+        )
+
+    def test_minify_at_load(self):
+        text = (
+            "<html>\n  <head>\n    <title>{{ Title }}</title>\n  </head>\n"
+            "  <body>\n    <p>Hello,   <b>world</b></p>\n"
+            "    <pre>\n  kept\n</pre>\n  </body>\n</html>\n"
+        )
+        template = Template(text, minify=True)
+        self.assertEqual(
+            template.render({"Title": "Hi"}),
+            "<html><head><title>Hi</title></head><body>"
+            "<p>Hello, <b>world</b></p><pre>\n  kept\n</pre></body></html>",
+        )
+        self.assertEqual(template.saved, len(text) - len(template.render({})) - 11)
+
+    def test_asset_references_are_fingerprinted(self):
+        assets = {"/index.css": "/index.0123456789.css"}
+        template = Template(
+            '<link href="/index.css" /><a href="/about">{{ Title }}</a>',
+            "/blog/",
+            assets=assets,
+        )
+        self.assertEqual(
+            template.render({"Title": "x"}),
+            '<link href="/blog/index.0123456789.css" /><a href="/blog/about">x</a>',
+        )
+        self.assertEqual(template.references, ["/index.0123456789.css", "/about"])
+
+
+class TestApplyBasepath(unittest.TestCase):
+    def test_rewrites_root_relative_urls(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode("a", "home", {"href": "/"}),
+                LeafNode("img", "", {"src": "/images/tom.png", "alt": "Tom"}),
+                LeafNode("a", "out", {"href": "https://boot.dev"}),
+                LeafNode("code", 'href="/raw"'),
+            ],
+        )
+        apply_basepath(node, "/site/")
+        self.assertEqual(
+            node.to_html(),
+            '<p><a href="/site/">home</a><img src="/site/images/tom.png" alt="Tom"></img>'
+            '<a href="https://boot.dev">out</a><code>href="/raw"</code></p>',
+        )
+    def test_rewrites_fingerprinted_assets(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode("img", "", {"src": "/images/tom.png"}),
+                LeafNode("a", "home", {"href": "/"}),
+            ],
+        )
+        apply_basepath(node, "/", {"/images/tom.png": "/images/tom.abc.png"})
+        self.assertEqual(
+            node.to_html(),
+            '<p><img src="/images/tom.abc.png"></img><a href="/">home</a></p>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import time
+import unittest
+
+from discovery import diff_snapshots
+from watch import Watcher
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_diff_snapshots(self):
+        old = {"a": (1, 10), "b": (1, 10), "c": (1, 10)}
+        new = {"a": (1, 10), "b": (2, 11), "d": (1, 1)}
+        self.assertEqual(diff_snapshots(old, new), (["b", "d"], ["c"]))
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/post/index.md", "# Post")
+        self.watcher = Watcher("/")
+        self.watcher.build_all()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, time.time_ns() + 1000000))
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_page_change_rebuilds_only_that_page(self):
+        home_mtime = os.stat("docs/index.html").st_mtime_ns
+        self.write("content/blog/post/index.md", "# Edited")
+        self.watcher.poll()
+        self.assertEqual(
+            self.read("docs/blog/post/index.html"),
+            "<title>Edited</title><div><h1>Edited</h1></div>",
+        )
+        self.assertEqual(os.stat("docs/index.html").st_mtime_ns, home_mtime)
+
+    def test_page_removed(self):
+        os.remove("content/blog/post/index.md")
+        self.watcher.poll()
+        self.assertFalse(os.path.exists("docs/blog/post/index.html"))
+
+    def test_edit_and_remove_in_one_poll(self):
+        self.write("content/index.md", "# Home again")
+        os.remove("content/blog/post/index.md")
+        self.watcher.poll()
+        self.assertEqual(
+            self.read("docs/index.html"),
+            "<title>Home again</title><div><h1>Home again</h1></div>",
+        )
+        self.assertFalse(os.path.exists("docs/blog/post/index.html"))
+        self.assertIsNone(self.watcher.page_index.get("./content/blog/post/index.md"))
+
+    def test_static_change(self):
+        self.write("static/index.css", "body { color: red }")
+        self.write("static/images/new.png", "png")
+        self.watcher.poll()
+        self.assertEqual(self.read("docs/index.css"), "body { color: red }")
+        self.assertEqual(self.read("docs/images/new.png"), "png")
+
+    def test_template_change_reuses_parsed_pages(self):
+        self.watcher.pages["./content/index.md"][2].children[0].tag = "h2"
+        self.write("template.html", "<main>{{ Content }}</main>")
+        self.watcher.poll()
+        self.assertEqual(
+            self.read("docs/index.html"), "<main><div><h2>Home</h2></div></main>"
+        )
+
+    def test_drafts_are_not_published(self):
+        self.write("content/blog/post/index.md", "---\ndraft: true\n---\n# Post")
+        self.watcher.poll()
+        self.assertFalse(os.path.exists("docs/blog/post/index.html"))
+        self.write("content/blog/post/index.md", "# Post")
+        self.watcher.poll()
+        self.assertTrue(os.path.exists("docs/blog/post/index.html"))
+
+    def test_drafts_flag_publishes_drafts(self):
+        self.write("content/draft.md", "---\ndraft: true\n---\n# Draft")
+        self.watcher.poll()
+        self.assertFalse(os.path.exists("docs/draft.html"))
+        watcher = Watcher("/", drafts=True)
+        watcher.build_all()
+        self.assertTrue(os.path.exists("docs/draft.html"))
+
+    def test_listings_follow_page_changes(self):
+        self.assertFalse(os.path.exists("docs/blog/index.html"))
+        self.write(
+            "content/blog/post/index.md",
+            "---\ndate: 2024-01-02\ntags: [news]\n---\n# Post",
+        )
+        self.watcher.poll()
+        self.assertIn('href="/blog/post/"', self.read("docs/blog/index.html"))
+        self.assertIn('href="/blog/post/"', self.read("docs/tags/news/index.html"))
+
+        self.write("content/blog/index.md", "# Blog")
+        self.watcher.poll()
+        self.assertEqual(
+            self.read("docs/blog/index.html"),
+            "<title>Blog</title><div><h1>Blog</h1></div>",
+        )
+
+        os.remove("content/blog/post/index.md")
+        self.watcher.poll()
+        self.assertFalse(os.path.exists("docs/tags/news/index.html"))
+        self.assertTrue(os.path.exists("docs/blog/index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import unittest
+
+from writer import ChangeSet, OutputWriter, write_atomic
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_writes_every_file(self):
+        paths = [
+            os.path.join(self.tmp.name, "docs", f"section-{i % 3}", f"{i}.html")
+            for i in range(50)
+        ]
+        with OutputWriter(threads=3, max_pending=4) as writer:
+            for i, path in enumerate(paths):
+                writer.write(path, f"<p>{i}</p>")
+        self.assertEqual(writer.errors, {})
+        self.assertEqual(len(writer.created_dirs), 3)
+        for i, path in enumerate(paths):
+            self.assertEqual(self.read(path), f"<p>{i}</p>")
+        for dir_path in writer.created_dirs:
+            self.assertEqual(
+                [name for name in os.listdir(dir_path) if name.endswith(".tmp")], []
+            )
+
+    def test_synchronous_without_threads(self):
+        path = os.path.join(self.tmp.name, "a", "index.html")
+        writer = OutputWriter(threads=0)
+        writer.write(path, "hello")
+        self.assertEqual(self.read(path), "hello")
+        self.assertEqual(writer.close(), {})
+
+    def test_collects_errors(self):
+        path = os.path.join(self.tmp.name, "index.html")
+        os.makedirs(path)
+        with OutputWriter(threads=1) as writer:
+            writer.write(path, "hello")
+        self.assertIn(path, writer.errors)
+
+    def test_streams_chunks_and_skips_identical_output(self):
+        path = os.path.join(self.tmp.name, "index.html")
+        self.assertTrue(write_atomic(path, iter(["<p>", "a", "</p>"])))
+        os.utime(path, ns=(0, 0))
+        self.assertFalse(write_atomic(path, iter(["<p>a", "</p>"])))
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+        self.assertTrue(write_atomic(path, iter(["<p>b</p>"])))
+        self.assertEqual(self.read(path), "<p>b</p>")
+        with OutputWriter(threads=2) as writer:
+            writer.write(path, iter(["<p>b</p>"]))
+            writer.write(path + "2", iter(["<p>b</p>"]))
+        self.assertEqual(writer.written, [path + "2"])
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)), ["index.html", "index.html2"]
+        )
+
+    def test_render_errors_surface_in_the_caller(self):
+        path = os.path.join(self.tmp.name, "index.html")
+
+        def chunks():
+            yield "new"
+            raise RuntimeError("render failed")
+
+        with OutputWriter(threads=2) as writer:
+            with self.assertRaises(RuntimeError):
+                writer.write(path, chunks())
+        self.assertEqual(writer.errors, {})
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_failed_write_keeps_old_file(self):
+        path = os.path.join(self.tmp.name, "index.html")
+        write_atomic(path, "old")
+
+        def chunks():
+            yield "new"
+            raise RuntimeError("render failed")
+
+        with self.assertRaises(RuntimeError):
+            write_atomic(path, chunks())
+        self.assertEqual(self.read(path), "old")
+        self.assertEqual(os.listdir(self.tmp.name), ["index.html"])
+
+
+class TestChangeSet(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.path = os.path.join(self.tmp.name, "cache", "changes.json")
+        os.makedirs(self.dest)
+        for name in ("a.html", "b.html"):
+            write_atomic(os.path.join(self.dest, name), name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_failed_build_is_marked_incomplete(self):
+        changes = ChangeSet()
+        changes.wrote([os.path.join(self.dest, "a.html")])
+        changes.save(self.path, self.dest, False)
+        self.assertEqual(
+            self.load(), {"complete": False, "changed": ["a.html"], "removed": []}
+        )
+
+    def test_unconsumed_changes_carry_into_next_build(self):
+        changes = ChangeSet()
+        changes.wrote([os.path.join(self.dest, "a.html")])
+        changes.deleted([os.path.join(self.dest, "gone.html")])
+        changes.save(self.path, self.dest, False)
+
+        changes = ChangeSet()
+        changes.load(self.path, self.dest)
+        changes.wrote([os.path.join(self.dest, "b.html")])
+        changed, removed = changes.save(self.path, self.dest, True)
+        self.assertEqual(
+            self.load(),
+            {
+                "complete": True,
+                "changed": ["a.html", "b.html"],
+                "removed": ["gone.html"],
+            },
+        )
+        self.assertEqual(removed, [os.path.join(self.dest, "gone.html")])
+
+
+if __name__ == "__main__":
+    unittest.main()
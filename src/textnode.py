@@ -12,6 +12,8 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -29,16 +31,41 @@ class TextNode:
 
 
 def text_node_to_html_node(text_node):
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    if text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    if text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    if text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    if text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    if text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
-    raise ValueError(f"invalid text type: {text_node.text_type}")
+    handler = TEXT_NODE_HANDLERS.get(text_node.text_type)
+    if handler is None:
+        raise ValueError(f"invalid text type: {text_node.text_type}")
+    return handler(text_node)
+
+
+def text_to_leaf_node(text_node):
+    return LeafNode(None, text_node.text)
+
+
+def bold_to_leaf_node(text_node):
+    return LeafNode("b", text_node.text)
+
+
+def italic_to_leaf_node(text_node):
+    return LeafNode("i", text_node.text)
+
+
+def code_to_leaf_node(text_node):
+    return LeafNode("code", text_node.text)
+
+
+def link_to_leaf_node(text_node):
+    return LeafNode("a", text_node.text, {"href": text_node.url})
+
+
+def image_to_leaf_node(text_node):
+    return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+
+
+TEXT_NODE_HANDLERS = {
+    TextType.TEXT: text_to_leaf_node,
+    TextType.BOLD: bold_to_leaf_node,
+    TextType.ITALIC: italic_to_leaf_node,
+    TextType.CODE: code_to_leaf_node,
+    TextType.LINK: link_to_leaf_node,
+    TextType.IMAGE: image_to_leaf_node,
+}
@@ -0,0 +1,214 @@
+import argparse
+import functools
+import os
+import shutil
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from copystatic import copy_file, copy_files_recursive
+from discovery import diff_snapshots, snapshot
+from gencontent import (
+    find_pages,
+    generate_listings,
+    load_page,
+    page_dest_path,
+    remove_page,
+    write_page,
+)
+from listings import default_page_size, plan_listings
+from main import (
+    default_basepath,
+    dir_path_content,
+    dir_path_public,
+    dir_path_static,
+    template_path,
+)
+from manifest import Manifest
+from pageindex import PageIndex
+from template import load_template
+
+
+default_port = 8888
+poll_interval = 0.1
+
+
+def public_path(from_path, source_dir_path):
+    rel_path = os.path.relpath(from_path, source_dir_path)
+    return os.path.join(dir_path_public, rel_path)
+
+
+class Watcher:
+    def __init__(self, basepath, drafts=False, page_size=default_page_size):
+        self.basepath = basepath
+        self.drafts = drafts
+        self.page_size = page_size
+        self.listings = Manifest(None)
+        self.template = None
+        self.page_index = PageIndex()
+        self.pages = {}
+        self.snapshots = {}
+
+    def build_all(self):
+        print("Deleting public directory...")
+        if os.path.exists(dir_path_public):
+            shutil.rmtree(dir_path_public)
+        print("Copying static files to public directory...")
+        copy_files_recursive(dir_path_static, dir_path_public)
+        print("Generating content...")
+        self.template = load_template(template_path, self.basepath)
+        pages = find_pages(dir_path_content, dir_path_public)
+        self.page_index.refresh(pages)
+        for from_path, dest_path in pages:
+            self.publish(from_path, dest_path)
+        self.update_listings()
+        self.snapshots = self.take_snapshots()
+
+    def take_snapshots(self):
+        return {
+            dir_path_content: snapshot(dir_path_content),
+            dir_path_static: snapshot(dir_path_static),
+            template_path: snapshot(template_path),
+        }
+
+    def poll(self):
+        snapshots = self.take_snapshots()
+        changed, _ = diff_snapshots(
+            self.snapshots[template_path], snapshots[template_path]
+        )
+        if changed:
+            self.template_changed()
+        changed, removed = diff_snapshots(
+            self.snapshots[dir_path_static], snapshots[dir_path_static]
+        )
+        for from_path in changed:
+            self.static_changed(from_path)
+        for from_path in removed:
+            self.static_removed(from_path)
+        changed, removed = diff_snapshots(
+            self.snapshots[dir_path_content], snapshots[dir_path_content]
+        )
+        for from_path in removed:
+            self.page_removed(from_path)
+        for from_path in changed:
+            self.page_changed(from_path)
+        if any(
+            snapshots[path] != self.snapshots[path]
+            for path in (dir_path_content, template_path)
+        ):
+            self.update_listings()
+        self.snapshots = snapshots
+
+    def page_changed(self, from_path):
+        dest_path = page_dest_path(public_path(from_path, dir_path_content))
+        try:
+            self.page_index.update(from_path, dest_path)
+        except OSError as e:
+            print(f"   ! {type(e).__name__}: {e}")
+            return
+        self.publish(from_path, dest_path)
+
+    def publish(self, from_path, dest_path):
+        if not self.drafts and self.page_index.get(from_path).draft:
+            print(f" * skipping draft {from_path}")
+            self.unpublish(from_path)
+            return
+        print(f" * {from_path} {template_path} -> {dest_path}")
+        try:
+            variables, node = load_page(from_path, self.basepath)
+            write_page(variables, node, self.template, dest_path)
+        except Exception as e:
+            print(f"   ! {type(e).__name__}: {e}")
+            return
+        self.pages[from_path] = (dest_path, variables, node)
+
+    def page_removed(self, from_path):
+        self.page_index.remove(from_path)
+        self.unpublish(from_path)
+
+    def unpublish(self, from_path):
+        entry = self.pages.pop(from_path, None)
+        if entry is not None:
+            remove_page(entry[0], dir_path_public)
+
+    def update_listings(self):
+        if self.template is None:
+            return
+        entries = [self.page_index.get(from_path) for from_path in self.pages]
+        taken = [dest_path for dest_path, _, _ in self.pages.values()]
+        listings = []
+        if self.page_size > 0:
+            listings = plan_listings(entries, dir_path_public, self.page_size, taken)
+        generate_listings(
+            listings,
+            self.template,
+            self.basepath,
+            self.listings,
+            dir_path_public,
+            taken=taken,
+        )
+
+    def static_changed(self, from_path):
+        dest_path = public_path(from_path, dir_path_static)
+        print(f" * {from_path} -> {dest_path}")
+        copy_file(from_path, dest_path)
+
+    def static_removed(self, from_path):
+        dest_path = public_path(from_path, dir_path_static)
+        print(f" * removing {dest_path}")
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+
+    def template_changed(self):
+        print(f" * {template_path} changed, re-rendering every page")
+        try:
+            self.template = load_template(template_path, self.basepath)
+        except Exception as e:
+            print(f"   ! {type(e).__name__}: {e}")
+            return
+        for dest_path, variables, node in self.pages.values():
+            write_page(variables, node, self.template, dest_path)
+
+
+def serve(port):
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=dir_path_public)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"Serving {dir_path_public} on http://localhost:{port}/")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the site, serve it and rebuild on changes."
+    )
+    parser.add_argument("basepath", nargs="?", default=default_basepath)
+    parser.add_argument("--port", type=int, default=default_port)
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also render pages marked draft: true in their front matter",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=default_page_size,
+        help="posts per generated section, tag and archive page (0 disables them)",
+    )
+    args = parser.parse_args()
+
+    watcher = Watcher(args.basepath, args.drafts, args.page_size)
+    watcher.build_all()
+    server = serve(args.port)
+    print("Watching for changes...")
+    try:
+        while True:
+            time.sleep(poll_interval)
+            watcher.poll()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import json
+import os
+import queue
+import threading
+
+
+default_write_threads = 4
+default_max_pending = 64
+
+
+class OutputWriter:
+    def __init__(self, threads=default_write_threads, max_pending=default_max_pending):
+        self.created_dirs = set()
+        self.errors = {}
+        self.written = []
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.workers = []
+        for _ in range(threads):
+            worker = threading.Thread(target=self.run, daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, dest_path, chunks, stream=False):
+        self.ensure_dir(os.path.dirname(dest_path))
+        if stream or not self.workers:
+            self.commit(dest_path, chunks)
+            return
+        if not isinstance(chunks, (str, bytes)):
+            chunks = list(chunks)
+        self.queue.put((dest_path, chunks))
+
+    def ensure_dir(self, dir_path):
+        if dir_path == "" or dir_path in self.created_dirs:
+            return
+        os.makedirs(dir_path, exist_ok=True)
+        self.created_dirs.add(dir_path)
+
+    def commit(self, dest_path, chunks):
+        if write_atomic(dest_path, chunks):
+            with self.lock:
+                self.written.append(dest_path)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            dest_path, chunks = item
+            try:
+                self.commit(dest_path, chunks)
+            except Exception as e:
+                with self.lock:
+                    self.errors[dest_path] = f"{type(e).__name__}: {e}"
+
+    def close(self):
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        return self.errors
+
+
+class ChangeSet:
+    def __init__(self):
+        self.changed = set()
+        self.removed = set()
+
+    def wrote(self, paths):
+        self.changed.update(os.path.normpath(path) for path in paths)
+
+    def deleted(self, paths):
+        self.removed.update(os.path.normpath(path) for path in paths)
+
+    def result(self):
+        changed = [path for path in self.changed if os.path.exists(path)]
+        removed = [path for path in self.removed if not os.path.exists(path)]
+        return sorted(changed), sorted(removed)
+
+    def load(self, path, dest_dir_path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as f:
+            data = json.load(f)
+        self.wrote(os.path.join(dest_dir_path, p) for p in data["changed"])
+        self.deleted(os.path.join(dest_dir_path, p) for p in data["removed"])
+
+    def save(self, path, dest_dir_path, complete):
+        changed, removed = self.result()
+        data = {
+            "complete": complete,
+            "changed": [os.path.relpath(p, dest_dir_path) for p in changed],
+            "removed": [os.path.relpath(p, dest_dir_path) for p in removed],
+        }
+        make_parent_dir(path)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, path)
+        return changed, removed
+
+
+def write_file(dest_path, chunks):
+    make_parent_dir(dest_path)
+    return write_atomic(dest_path, chunks)
+
+
+def make_parent_dir(dest_path):
+    dest_dir_path = os.path.dirname(dest_path)
+    if dest_dir_path != "":
+        os.makedirs(dest_dir_path, exist_ok=True)
+
+
+def write_atomic(dest_path, chunks):
+    return replace_if_changed(write_temp(dest_path, chunks), dest_path)
+
+
+def write_temp(dest_path, chunks):
+    tmp_path = f"{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if isinstance(chunks, bytes):
+            with open(tmp_path, "wb") as f:
+                f.write(chunks)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(chunks)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def replace_if_changed(tmp_path, dest_path):
+    try:
+        if same_content(tmp_path, dest_path):
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+def same_content(path, other_path):
+    try:
+        if os.path.getsize(path) != os.path.getsize(other_path):
+            return False
+        with open(path, "rb") as f, open(other_path, "rb") as other:
+            while True:
+                chunk = f.read(1 << 16)
+                if chunk != other.read(1 << 16):
+                    return False
+                if chunk == b"":
+                    return True
+    except OSError:
+        return False